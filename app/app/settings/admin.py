@@ -0,0 +1,8 @@
+"""
+Settings for workers serving the admin, with sessions, CSRF and static files.
+
+Same as the production settings, kept as their own profile so deployments
+can route /admin/ here and run API workers with app.settings.api.
+"""
+
+from app.settings.prod import *  # noqa: F401, F403
@@ -0,0 +1,38 @@
+"""
+Lean settings for API workers, on top of the production ones.
+
+The token authenticated API in user, recipe and cats needs no sessions,
+messages, static files, CSRF or admin, so they are left out of the apps,
+the middleware chain and the import graph. Serve the admin from workers
+using app.settings.admin instead.
+"""
+
+from app.settings.prod import *  # noqa: F401, F403
+from app.settings.prod import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+BROWSER_ONLY_APPS = (
+    "django.contrib.admin",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+)
+
+BROWSER_ONLY_MIDDLEWARE = (
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in BROWSER_ONLY_APPS]
+
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in BROWSER_ONLY_MIDDLEWARE]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["core.renderers.ORJSONRenderer"],
+    "DEFAULT_AUTHENTICATION_CLASSES": ["core.authentication.CachedTokenAuthentication"],
+}
@@ -44,6 +44,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.PerformanceMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
+    "core.middleware.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -78,15 +81,126 @@ WSGI_APPLICATION = "app.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # Postgres, pinging persistent connections on their first use in a request
+        "ENGINE": "core.backends.postgresql",
         "HOST": os.environ.get("DB_HOST"),
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASSWORD"),
+        "PORT": os.environ.get("DB_PORT", ""),
+        # Keep connections open between requests
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        # Must be disabled behind a transaction-pooling pgbouncer
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("DB_POOLED") == "1",
     }
 }
+
+# Read replicas, as comma separated hosts sharing the primary's other settings.
+# Safe requests read from one of them through core.db_routers.ReplicaRouter
+DB_REPLICA_HOSTS = [
+    host.strip() for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",") if host
+]
+DATABASE_REPLICAS = [f"replica_{index}" for index in range(len(DB_REPLICA_HOSTS))]
+for alias, host in zip(DATABASE_REPLICAS, DB_REPLICA_HOSTS):
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db_routers.ReplicaRouter"]
+
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
+# Caches
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# Redis shared by all server workers. Without it every worker gets its own
+# LocMem cache, and writes only invalidate entries of the worker handling them
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+    AUTH_CACHE = {**SHARED_CACHE, "KEY_PREFIX": "auth", "TIMEOUT": 300}
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+    # Revoking a token only forgets it in the worker handling the request, so
+    # other workers keep accepting it until their entry times out
+    AUTH_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+        "TIMEOUT": 30,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+
+CACHES = {
+    "default": SHARED_CACHE,
+    "auth": AUTH_CACHE,
+}
+
+# Whether tag and ingredient lists are cached. Needs a cache shared by all
+# workers, or workers that did not handle a write keep serving the old list
+CACHE_LISTS = REDIS_URL is not None
+
+# Cache alias holding token to user lookups for CachedTokenAuthentication
+TOKEN_AUTH_CACHE = "auth"
+
+# Seconds before an auth token expires and is rotated on login, None to never expire
+TOKEN_TTL = int(os.environ["TOKEN_TTL"]) if os.environ.get("TOKEN_TTL") else None
+
+# Minimum seconds between two last_login writes for the same user
+LAST_LOGIN_UPDATE_INTERVAL = 300
+
+# Cache alias remembering recent writers. Must be shared by all workers when
+# using replicas, so set REDIS_URL
+REPLICA_STICKY_CACHE = "default"
+
+# Seconds a client reads from the primary after an unsafe request
+REPLICA_STICKY_SECONDS = 5
+
+# Share of requests timed by core.middleware.PerformanceMiddleware, from 0 to 1
+PERFORMANCE_SAMPLE_RATE = float(os.environ.get("PERFORMANCE_SAMPLE_RATE", 0.1))
+
+# Directory where every worker writes its metrics for /metrics/ to add them up,
+# which serve sets and empties on start. Unset, each worker reports its own
+METRICS_DIR = os.environ.get("METRICS_DIR")
+
+# Seconds between two writes of a worker's metrics to METRICS_DIR
+METRICS_FLUSH_SECONDS = 1
+
+# Bearer token scrapers must send to /metrics/, which is not served without one
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Queries slower than this many milliseconds are logged with their view,
+# serializer and stack by core.middleware.QueryBudgetMiddleware, None to disable
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 100))
+
+# Whether going over a view's query budget raises instead of being logged
+QUERY_BUDGET_STRICT = False
+
+# Share of over budget requests logged when not strict, from 0 to 1
+QUERY_BUDGET_LOG_SAMPLE_RATE = 0.1
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+# Hashes made by any hasher after the first are upgraded on the next login
+
+PASSWORD_HASHERS = [
+    "core.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", 65536))
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", 1))
+
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
 
@@ -124,3 +238,15 @@ USE_TZ = True
 STATIC_URL = "/static/"
 
 AUTH_USER_MODEL = "core.User"
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
@@ -45,6 +45,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.PerformanceMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
+    "core.middleware.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -81,10 +84,90 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
-    }
+    },
+    # Never replicated to, so tests can tell which database served a read
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
 }
+
+# Replica aliases ReplicaRouter reads from, enabled per test
+DATABASE_REPLICAS = []
+
+DATABASE_ROUTERS = ["core.db_routers.ReplicaRouter"]
+
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
+# Caches
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "auth": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+# Whether tag and ingredient lists are cached. Needs a cache shared by all
+# workers, or workers that did not handle a write keep serving the old list
+CACHE_LISTS = True
+
+# Cache alias holding token to user lookups for CachedTokenAuthentication
+TOKEN_AUTH_CACHE = "auth"
+
+# Seconds before an auth token expires and is rotated on login, None to never expire
+TOKEN_TTL = None
+
+# Minimum seconds between two last_login writes for the same user
+LAST_LOGIN_UPDATE_INTERVAL = 300
+
+# Cache alias remembering recent writers. Must be shared by all workers when
+# using replicas, so set REDIS_URL
+REPLICA_STICKY_CACHE = "default"
+
+# Seconds a client reads from the primary after an unsafe request
+REPLICA_STICKY_SECONDS = 5
+
+# Share of requests timed by core.middleware.PerformanceMiddleware, from 0 to 1
+PERFORMANCE_SAMPLE_RATE = 1.0
+
+# Directory where every worker writes its metrics for /metrics/ to add them up,
+# which serve sets and empties on start. Unset, each worker reports its own
+METRICS_DIR = None
+
+# Seconds between two writes of a worker's metrics to METRICS_DIR
+METRICS_FLUSH_SECONDS = 1
+
+# Bearer token scrapers must send to /metrics/, which is not served without one
+METRICS_TOKEN = None
+
+# Queries slower than this many milliseconds are logged with their view,
+# serializer and stack by core.middleware.QueryBudgetMiddleware, None to disable
+SLOW_QUERY_THRESHOLD_MS = 100
+
+# Whether going over a view's query budget raises instead of being logged
+QUERY_BUDGET_STRICT = True
+
+# Share of over budget requests logged when not strict, from 0 to 1
+QUERY_BUDGET_LOG_SAMPLE_RATE = 1.0
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+ARGON2_TIME_COST = 1
+ARGON2_MEMORY_COST = 1024
+ARGON2_PARALLELISM = 1
+
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
 
@@ -122,3 +205,15 @@ USE_TZ = True
 STATIC_URL = "/static/"
 
 AUTH_USER_MODEL = "core.User"
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
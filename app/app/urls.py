@@ -1,9 +1,17 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path
 
+from core import views as core_views
+
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/user/", include("user.urls")),
     path("api/recipe/", include("recipe.urls")),
     path("api/cats/", include("cats.urls")),
+    path("health/", include("core.urls")),
+    path("metrics/", core_views.metrics, name="metrics"),
 ]
+
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.append(path("admin/", admin.site.urls))
@@ -1,6 +1,11 @@
+import asyncio
+
+from django.test import Client
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from cats import views
+
 
 class TestCatsApi(APITestCase):
     def test_hello_returns_a_200_with_meow(self):
@@ -18,3 +23,25 @@ class TestCatsApi(APITestCase):
         res = self.client.post("/api/cats/greet", {}, format="json")
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("errors", res.json())
+
+    async def test_hello_is_served_under_asgi(self):
+        res = await self.async_client.get("/api/cats/hello")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["message"], "meow")
+
+    async def test_greet_is_served_under_asgi(self):
+        res = await self.async_client.post(
+            "/api/cats/greet", {"name": "cat"}, content_type="application/json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["greeting"], "hello cat")
+
+    def test_views_are_async(self):
+        self.assertTrue(asyncio.iscoroutinefunction(views.cats))
+        self.assertTrue(asyncio.iscoroutinefunction(views.greet))
+
+    def test_greet_needs_no_csrf_token(self):
+        res = Client(enforce_csrf_checks=True).post(
+            "/api/cats/greet", {"name": "cat"}, content_type="application/json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
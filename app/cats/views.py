@@ -1,25 +1,29 @@
-from django.http import JsonResponse
-from rest_framework.parsers import JSONParser
-
 from cats.serializers import (
     GreetingRequestSerializer,
     GreetingResponse,
     GreetingResponseSerializer,
 )
+from core.http import ORJSONResponse
+from core.parsers import ORJSONParser
 
 
-def cats(request):
-    return JsonResponse({"message": "meow"})
+async def cats(request):
+    return ORJSONResponse({"message": "meow"})
 
 
-def greet(request):
-    data = JSONParser().parse(request)
+async def greet(request):
+    data = ORJSONParser().parse(request)
     serializer = GreetingRequestSerializer(data=data)
     if serializer.is_valid():
         greeting = serializer.save()
         name = greeting.name
         response = GreetingResponse(name)
         response_serializer = GreetingResponseSerializer(response)
-        return JsonResponse(response_serializer.data)
+        return ORJSONResponse(response_serializer.data)
+
+    return ORJSONResponse({"errors": serializer.errors}, status=400)
+
 
-    return JsonResponse({"errors": serializer.errors}, status=400)
+# A token-free JSON endpoint, so no CSRF cookie to check. Set directly because
+# Django 4.0's csrf_exempt wraps views in a sync function
+greet.csrf_exempt = True
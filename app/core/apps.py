@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = "core"
+
+    def ready(self):
+        from core import signals  # noqa: F401
+        from core.db import check_persistent_connections
+        from core.middleware import install_query_observer
+
+        request_started.connect(check_persistent_connections)
+        connection_created.connect(install_query_observer)
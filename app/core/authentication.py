@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from core.db_routers import primary_reads
+
+
+def get_token_cache():
+    return caches[settings.TOKEN_AUTH_CACHE]
+
+
+def token_cache_key(key):
+    return f"auth-token:{key}"
+
+
+def forget_tokens(*keys):
+    get_token_cache().delete_many([token_cache_key(key) for key in keys])
+
+
+def token_expired(token):
+    if settings.TOKEN_TTL is None:
+        return False
+    return token.created < timezone.now() - timedelta(seconds=settings.TOKEN_TTL)
+
+
+def expired_tokens():
+    if settings.TOKEN_TTL is None:
+        return Token.objects.none()
+    cutoff = timezone.now() - timedelta(seconds=settings.TOKEN_TTL)
+    return Token.objects.filter(created__lt=cutoff)
+
+
+def issue_token(user):
+    token = getattr(user, "auth_token", None)
+    if token is not None and not token_expired(token):
+        return token
+
+    if token is not None:
+        token.delete()
+    try:
+        with transaction.atomic():
+            return Token.objects.create(user=user)
+    except IntegrityError:
+        return Token.objects.get(user=user)
+
+
+def record_login(user):
+    interval = timedelta(seconds=settings.LAST_LOGIN_UPDATE_INTERVAL)
+    now = timezone.now()
+    if user.last_login is None or user.last_login < now - interval:
+        get_user_model().objects.filter(pk=user.pk).update(last_login=now)
+        user.last_login = now
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            with primary_reads():
+                credentials = super().authenticate_credentials(key)
+            cache.set(cache_key, credentials)
+
+        if token_expired(credentials[1]):
+            raise exceptions.AuthenticationFailed(_("Token has expired."))
+
+        return credentials
@@ -0,0 +1,7 @@
+from django.db.backends.postgresql import base
+
+from core.db import HealthCheckOnFirstUseMixin
+
+
+class DatabaseWrapper(HealthCheckOnFirstUseMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,102 @@
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from core.models import Ingredient, Recipe, Tag
+from core.search import refresh_search
+
+WORDS = (
+    "apple basil bean beef butter carrot cheese chicken chili coconut corn cream "
+    "curry egg garlic ginger honey lamb lemon lentil lime mint mushroom noodle "
+    "onion orange pasta pea pepper pork potato rice salmon spinach tofu tomato"
+).split()
+
+
+def get_or_seed_user(email, recipes, tags, ingredients, reseed=False, batch_size=1000):
+    user_model = get_user_model()
+    if reseed:
+        user_model.objects.filter(email=email).delete()
+
+    user = user_model.objects.filter(email=email).first()
+    if user is None:
+        user = user_model.objects.create_user(email, "benchmark", name="benchmark")
+        seed_user_data(user, recipes, tags, ingredients, batch_size=batch_size)
+
+    return user
+
+
+@transaction.atomic
+def seed_user_data(user, recipes, tags, ingredients, per_recipe=3, batch_size=1000):
+    rng = random.Random(user.pk)
+
+    Tag.objects.bulk_create(
+        (Tag(user=user, name=f"{rng.choice(WORDS)} {i}") for i in range(tags)),
+        batch_size=batch_size,
+    )
+    Ingredient.objects.bulk_create(
+        (
+            Ingredient(user=user, name=f"{rng.choice(WORDS)} {i}")
+            for i in range(ingredients)
+        ),
+        batch_size=batch_size,
+    )
+    tag_ids = list(Tag.objects.filter(user=user).values_list("id", flat=True))
+    ingredient_ids = list(
+        Ingredient.objects.filter(user=user).values_list("id", flat=True)
+    )
+
+    for start in range(0, recipes, batch_size):
+        batch = Recipe.objects.bulk_create(
+            Recipe(
+                user=user,
+                title=" ".join(rng.sample(WORDS, 3)) + f" {i}",
+                time_minutes=rng.randint(5, 180),
+                price=Decimal(rng.randint(100, 99999)) / 100,
+            )
+            for i in range(start, min(start + batch_size, recipes))
+        )
+        Recipe.tags.through.objects.bulk_create(
+            Recipe.tags.through(recipe_id=recipe.id, tag_id=tag_id)
+            for recipe in batch
+            for tag_id in rng.sample(tag_ids, min(per_recipe, len(tag_ids)))
+        )
+        Recipe.ingredients.through.objects.bulk_create(
+            Recipe.ingredients.through(recipe_id=recipe.id, ingredient_id=ingredient_id)
+            for recipe in batch
+            for ingredient_id in rng.sample(
+                ingredient_ids, min(per_recipe, len(ingredient_ids))
+            )
+        )
+        refresh_search([recipe.id for recipe in batch])
+
+
+def time_calls(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarise(timings):
+    return {
+        "mean": statistics.mean(timings),
+        "p50": percentile(timings, 50),
+        "p95": percentile(timings, 95),
+        "p99": percentile(timings, 99),
+    }
+
+
+def format_summary(summary):
+    return " ".join(f"{key}={value * 1000:.2f}ms" for key, value in summary.items())
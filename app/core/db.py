@@ -0,0 +1,25 @@
+from django.db import connections
+
+
+class HealthCheckOnFirstUseMixin:
+    """Pings a persistent connection the first time a request uses it.
+
+    Requests that never touch the database, or a given replica, skip the ping.
+    """
+
+    health_check_pending = False
+
+    def ensure_connection(self):
+        if self.health_check_pending and not self.in_atomic_block:
+            self.health_check_pending = False
+            if self.connection is not None and not self.is_usable():
+                self.close()
+        super().ensure_connection()
+
+
+def check_persistent_connections(**kwargs):
+    for connection in connections.all():
+        if connection.connection is not None and connection.settings_dict.get(
+            "CONN_HEALTH_CHECKS"
+        ):
+            connection.health_check_pending = True
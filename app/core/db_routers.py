@@ -0,0 +1,84 @@
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+from django.conf import settings
+from django.core.cache import caches
+
+PRIMARY = "default"
+
+read_replica = ContextVar("read_replica", default=None)
+
+
+def choose_replica():
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+@contextmanager
+def primary_reads():
+    """Reads from the primary, for results outliving the request such as caches.
+
+    A replica read right after a write would otherwise cache data the write
+    already replaced, until the cache entry expires.
+    """
+    token = read_replica.set(None)
+    try:
+        yield
+    finally:
+        read_replica.reset(token)
+
+
+def client_sticky_key(client):
+    return f"replica-sticky:{hashlib.md5(client.encode()).hexdigest()}"
+
+
+def sticky_key(request):
+    client = request.META.get("HTTP_AUTHORIZATION") or request.META.get("REMOTE_ADDR")
+    if not client:
+        return None
+    return client_sticky_key(client)
+
+
+def user_sticky_key(user_pk):
+    return f"replica-sticky-user:{user_pk}"
+
+
+def get_sticky_cache():
+    return caches[settings.REPLICA_STICKY_CACHE]
+
+
+def stick_to_primary(*keys):
+    get_sticky_cache().set_many(
+        dict.fromkeys(keys, True), settings.REPLICA_STICKY_SECONDS
+    )
+
+
+def stream_in_context(content):
+    """Iterates content with the read_replica of the caller.
+
+    Streaming bodies are consumed after the middleware has reset read_replica,
+    and would otherwise always be read from the primary.
+    """
+    context = copy_context()
+    iterator = iter(content)
+    return iter(lambda: context.run(next, iterator, None), None)
+
+
+class ReplicaRouter:
+    """Reads from the replica picked for the current request, if any.
+
+    Everything else, writes and reads outside safe requests, uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_replica.get() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the primary, so objects from any of them mix
+        return True
@@ -0,0 +1,6 @@
+from django.db import connections
+
+
+def check_database(alias="default"):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
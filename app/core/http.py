@@ -0,0 +1,9 @@
+from django.http import HttpResponse
+
+from core.renderers import dumps
+
+
+class ORJSONResponse(HttpResponse):
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
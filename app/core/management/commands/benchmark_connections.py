@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from core.benchmarking import format_summary, summarise, time_calls
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures per-request database latency through the request signals, "
+        "opening a connection per request versus reusing a persistent one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--conn-max-age", type=int, default=60)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        original_max_age = connection.settings_dict["CONN_MAX_AGE"]
+
+        def request():
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            request_finished.send(sender=self.__class__)
+
+        try:
+            for label, max_age in (
+                ("new connection per request", 0),
+                ("persistent connection", options["conn_max_age"]),
+            ):
+                connection.close()
+                connection.settings_dict["CONN_MAX_AGE"] = max_age
+                timings = time_calls(request, options["requests"])
+                self.stdout.write(
+                    self.style.SUCCESS(f"{label}: {format_summary(summarise(timings))}")
+                )
+        finally:
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = original_max_age
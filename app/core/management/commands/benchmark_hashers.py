@@ -0,0 +1,37 @@
+import time
+
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports single-core hashes per second for the configured password "
+        "hashers, i.e. how many user/create/ or user/token/ requests one core "
+        "can serve."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hasher", action="append", dest="hashers")
+        parser.add_argument("--seconds", type=float, default=2)
+
+    def handle(self, *args, **options):
+        if options["hashers"]:
+            hashers = [get_hasher(algorithm) for algorithm in options["hashers"]]
+        else:
+            hashers = get_hashers()
+
+        for hasher in hashers:
+            rate = self.measure(hasher, options["seconds"])
+            self.stdout.write(
+                self.style.SUCCESS(f"{hasher.algorithm}: {rate:.1f} hashes/s per core")
+            )
+
+    def measure(self, hasher, seconds):
+        salt = hasher.salt()
+        count = 0
+        start = time.perf_counter()
+        while not count or time.perf_counter() - start < seconds:
+            hasher.encode("benchmark password", salt)
+            count += 1
+        return count / (time.perf_counter() - start)
@@ -0,0 +1,76 @@
+import io
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarking import format_summary, summarise, time_calls
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+
+def sample_recipe(i, nested):
+    def related(kind, count):
+        if nested:
+            return [{"id": i * 10 + n, "name": f"{kind} {n}"} for n in range(count)]
+        return [i * 10 + n for n in range(count)]
+
+    return {
+        "id": i,
+        "title": f"Recipe number {i} with a reasonably long title",
+        "ingredients": related("ingredient", 6),
+        "tags": related("tag", 3),
+        "link": f"https://example.com/recipes/{i}",
+        "price": Decimal("12.50"),
+        "time_minutes": 45,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's stdlib JSON renderer and parser with the orjson ones on "
+        "recipe list and detail payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipes", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        payloads = {
+            "recipe list page": {
+                "next": None,
+                "previous": None,
+                "results": [
+                    sample_recipe(i, nested=False) for i in range(options["recipes"])
+                ],
+            },
+            "recipe details": [
+                sample_recipe(i, nested=True) for i in range(options["recipes"])
+            ],
+        }
+        pairs = (
+            ("stdlib", JSONRenderer(), JSONParser()),
+            ("orjson", ORJSONRenderer(), ORJSONParser()),
+        )
+
+        for name, payload in payloads.items():
+            for label, renderer, parser in pairs:
+                rendered = renderer.render(payload)
+                render = summarise(
+                    time_calls(lambda: renderer.render(payload), options["repeat"])
+                )
+                parse = summarise(
+                    time_calls(
+                        lambda: parser.parse(io.BytesIO(rendered)), options["repeat"]
+                    )
+                )
+                self.stdout.write(
+                    f"{name} ({len(rendered)} bytes) {label} "
+                    f"render: {format_summary(render)}"
+                )
+                self.stdout.write(
+                    f"{name} ({len(rendered)} bytes) {label} "
+                    f"parse: {format_summary(parse)}"
+                )
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand
+
+from core.benchmarking import format_summary, get_or_seed_user, summarise, time_calls
+from core.models import Ingredient, Recipe, Tag
+from recipe.filters import filter_recipes
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a benchmark user and reports query plans and latencies for the "
+        "recipe app list and filter queries. Run it before and after migrating "
+        "to compare, e.g. with --recipes 100000 for filter latencies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", default="benchmark@example.com")
+        parser.add_argument("--recipes", type=int, default=10000)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument("--ingredients", type=int, default=200)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--reseed", action="store_true")
+        parser.add_argument("--no-explain", action="store_true")
+
+    def handle(self, *args, **options):
+        user = get_or_seed_user(
+            options["email"],
+            options["recipes"],
+            options["tags"],
+            options["ingredients"],
+            reseed=options["reseed"],
+        )
+        self.stdout.write(
+            f"Benchmarking user {user.email} with "
+            f"{Recipe.objects.filter(user=user).count()} recipes"
+        )
+
+        for name, queryset in self.get_querysets(user, options["page_size"]).items():
+            if not options["no_explain"]:
+                self.stdout.write(f"\n{name}\n{queryset.explain()}")
+            timings = time_calls(lambda: list(queryset.all()), options["repeat"])
+            self.stdout.write(
+                self.style.SUCCESS(f"{name}: {format_summary(summarise(timings))}")
+            )
+
+    def get_querysets(self, user, page_size):
+        tag = Tag.objects.filter(user=user).first()
+        ingredient = Ingredient.objects.filter(user=user).first()
+        tag_ids = list(Tag.objects.filter(user=user).values_list("id", flat=True)[:2])
+        recipes = Recipe.objects.filter(user=user)
+        return {
+            "tag list": Tag.objects.filter(user=user).order_by("-name", "-id")[
+                :page_size
+            ],
+            "ingredient list": Ingredient.objects.filter(user=user).order_by(
+                "-name", "-id"
+            )[:page_size],
+            "recipe list": Recipe.objects.filter(user=user).order_by("-title", "-id")[
+                :page_size
+            ],
+            "recipes by tag": Recipe.tags.through.objects.filter(tag=tag).values_list(
+                "recipe_id", flat=True
+            )[:page_size],
+            "recipes by ingredient": Recipe.ingredients.through.objects.filter(
+                ingredient=ingredient
+            ).values_list("recipe_id", flat=True)[:page_size],
+            "recipes with any tag": filter_recipes(recipes, tags=tag_ids).order_by(
+                "-title", "-id"
+            )[:page_size],
+            "recipes with all tags": filter_recipes(
+                recipes, match_all=True, tags=tag_ids
+            ).order_by("-title", "-id")[:page_size],
+            "recipes with tag and ingredient": filter_recipes(
+                recipes, tags=tag_ids[:1], ingredients=[ingredient.id]
+            ).order_by("-title", "-id")[:page_size],
+            "recipes in price and time range": filter_recipes(
+                recipes,
+                ranges={"price__gte": 10, "price__lte": 20, "time_minutes__lte": 30},
+            ).order_by("-title", "-id")[:page_size],
+        }
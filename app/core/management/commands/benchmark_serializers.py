@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+
+from core.benchmarking import format_summary, get_or_seed_user, summarise, time_calls
+from core.models import Ingredient, Recipe, Tag
+from recipe.serializers import IngredientSerializer, RecipeSerializer, TagSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the model serializers with the .values() fast path used by "
+        "the recipe app list endpoints, from query to Python data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", default="benchmark@example.com")
+        parser.add_argument("--recipes", type=int, default=10000)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument("--ingredients", type=int, default=200)
+        parser.add_argument("--page-size", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--reseed", action="store_true")
+
+    def handle(self, *args, **options):
+        user = get_or_seed_user(
+            options["email"],
+            options["recipes"],
+            options["tags"],
+            options["ingredients"],
+            reseed=options["reseed"],
+        )
+        page_size = options["page_size"]
+        lists = (
+            ("tag list", TagSerializer, Tag.objects.order_by("-name", "-id")),
+            (
+                "ingredient list",
+                IngredientSerializer,
+                Ingredient.objects.order_by("-name", "-id"),
+            ),
+            (
+                "recipe list",
+                RecipeSerializer,
+                RecipeSerializer.setup_eager_loading(
+                    Recipe.objects.defer("search_text", "search_vector").order_by(
+                        "-title", "-id"
+                    )
+                ),
+            ),
+        )
+
+        for name, serializer_class, queryset in lists:
+            queryset = queryset.filter(user=user)
+
+            def serialize():
+                return serializer_class(queryset[:page_size], many=True).data
+
+            def represent():
+                return serializer_class.represent_values(
+                    serializer_class.list_values(queryset)[:page_size]
+                )
+
+            if serialize() != represent():
+                self.stderr.write(self.style.ERROR(f"{name}: outputs differ"))
+
+            slow = summarise(time_calls(serialize, options["repeat"]))
+            fast = summarise(time_calls(represent, options["repeat"]))
+            self.stdout.write(f"{name} serializer: {format_summary(slow)}")
+            self.stdout.write(f"{name} values: {format_summary(fast)}")
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {slow['p50'] / fast['p50']:.1f}x faster at p50"
+                )
+            )
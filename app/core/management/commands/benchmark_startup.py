@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarking import format_summary, summarise
+
+# Runs in a fresh interpreter per profile, so nothing is imported beforehand
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+startup = time.perf_counter() - start
+from wsgiref.util import setup_testing_defaults
+
+path, repeat = sys.argv[1], int(sys.argv[2])
+statuses = []
+
+def request():
+    environ = {"PATH_INFO": path}
+    setup_testing_defaults(environ)
+    response = application(environ, lambda status, headers: statuses.append(status))
+    b"".join(response)
+    response.close()
+
+request()
+timings = []
+for _ in range(repeat):
+    start = time.perf_counter()
+    request()
+    timings.append(time.perf_counter() - start)
+
+print(json.dumps({
+    "startup": startup,
+    "modules": len(sys.modules),
+    "status": statuses[-1],
+    "timings": timings,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares settings profiles in fresh interpreters: process and Django "
+        "startup time, modules imported and per-request latency of a path "
+        "through the full WSGI handler and middleware chain."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            action="append",
+            dest="profiles",
+            help="Settings module suffix, e.g. api for app.settings.api",
+        )
+        parser.add_argument("--path", default="/api/cats/hello")
+        parser.add_argument("--repeat", type=int, default=1000)
+        parser.add_argument("--runs", type=int, default=3)
+
+    def handle(self, *args, **options):
+        profiles = options["profiles"] or ["prod", "api"]
+        for profile in profiles:
+            runs = [self.probe(profile, options) for _ in range(options["runs"])]
+            process = summarise([run["process"] for run in runs])
+            startup = summarise([run["startup"] for run in runs])
+            requests = summarise([t for run in runs for t in run["timings"]])
+            self.stdout.write(
+                f"{profile}: {runs[0]['modules']} modules, "
+                f"{options['path']} answered {runs[0]['status']}"
+            )
+            self.stdout.write(f"{profile} process: {format_summary(process)}")
+            self.stdout.write(f"{profile} django setup: {format_summary(startup)}")
+            self.stdout.write(
+                self.style.SUCCESS(f"{profile} per request: {format_summary(requests)}")
+            )
+
+    def probe(self, profile, options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": f"app.settings.{profile}"}
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE, options["path"], str(options["repeat"])],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise CommandError(f"{profile} failed:\n{result.stderr}")
+        return {**json.loads(result.stdout.splitlines()[-1]), "process": elapsed}
@@ -0,0 +1,163 @@
+import csv
+import sys
+import time
+from itertools import islice
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework import serializers
+
+from core.models import Ingredient, Recipe, Tag
+from core.search import refresh_search
+from recipe.cache import invalidate_list
+
+
+class ImportRecipeSerializer(serializers.ModelSerializer):
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=255), default=list
+    )
+    ingredients = serializers.ListField(
+        child=serializers.CharField(max_length=255), default=list
+    )
+
+    class Meta:
+        model = Recipe
+        fields = ("title", "time_minutes", "price", "link", "tags", "ingredients")
+
+
+def read_json_lines(file):
+    for line_number, line in enumerate(file, start=1):
+        if line.strip():
+            try:
+                yield line_number, orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                yield line_number, exc
+
+
+def read_csv(file, separator):
+    reader = csv.DictReader(file)
+    for row in reader:
+        for field in ("tags", "ingredients"):
+            names = row.get(field) or ""
+            row[field] = [name for name in names.split(separator) if name.strip()]
+        yield reader.line_num, row
+
+
+def get_or_create_names(model, user, names):
+    ids = {}
+    for pk, name in (
+        model.objects.filter(user=user, name__in=names)
+        .order_by("id")
+        .values_list("id", "name")
+    ):
+        ids.setdefault(name, pk)
+
+    missing = [name for name in names if name not in ids]
+    for obj in model.objects.bulk_create(model(user=user, name=n) for n in missing):
+        ids[obj.name] = obj.pk
+    return ids, bool(missing)
+
+
+@transaction.atomic
+def import_batch(user, items):
+    tags, new_tags = get_or_create_names(
+        Tag, user, {name for item in items for name in item["tags"]}
+    )
+    ingredients, new_ingredients = get_or_create_names(
+        Ingredient, user, {name for item in items for name in item["ingredients"]}
+    )
+
+    recipes = Recipe.objects.bulk_create(
+        Recipe(
+            user=user,
+            **{
+                field: value
+                for field, value in item.items()
+                if field not in ("tags", "ingredients")
+            },
+        )
+        for item in items
+    )
+    Recipe.tags.through.objects.bulk_create(
+        Recipe.tags.through(recipe_id=recipe.id, tag_id=pk)
+        for recipe, item in zip(recipes, items)
+        for pk in {tags[name] for name in item["tags"]}
+    )
+    Recipe.ingredients.through.objects.bulk_create(
+        Recipe.ingredients.through(recipe_id=recipe.id, ingredient_id=pk)
+        for recipe, item in zip(recipes, items)
+        for pk in {ingredients[name] for name in item["ingredients"]}
+    )
+    refresh_search([recipe.id for recipe in recipes])
+
+    if new_tags:
+        transaction.on_commit(lambda: invalidate_list(Tag, user.pk))
+    if new_ingredients:
+        transaction.on_commit(lambda: invalidate_list(Ingredient, user.pk))
+    return len(recipes)
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports recipes for a user from a JSON Lines or CSV file ('-' for stdin), "
+        "creating missing tags and ingredients by name. CSV rows list tag and "
+        "ingredient names joined by --separator. Each batch commits on its own."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--email", required=True)
+        parser.add_argument("--format", choices=("jsonl", "csv"))
+        parser.add_argument("--separator", default="|")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}")
+
+        path = options["path"]
+        file_format = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        if path == "-":
+            self.import_file(sys.stdin, file_format, user, options)
+        else:
+            with open(path, newline="", encoding="utf-8") as file:
+                self.import_file(file, file_format, user, options)
+
+    def import_file(self, file, file_format, user, options):
+        if file_format == "csv":
+            rows = read_csv(file, options["separator"])
+        else:
+            rows = read_json_lines(file)
+        items = self.validated(rows)
+
+        imported, start = 0, time.perf_counter()
+        while batch := list(islice(items, options["batch_size"])):
+            imported += import_batch(user, batch)
+            rate = imported / (time.perf_counter() - start)
+            self.stdout.write(f"Imported {imported} recipes ({rate:.0f} recipes/s)")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} recipes for {user.email}, "
+                f"skipped {self.skipped} invalid rows "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+        )
+
+    def validated(self, rows):
+        self.skipped = 0
+        for line_number, row in rows:
+            if isinstance(row, Exception):
+                errors = str(row)
+            else:
+                serializer = ImportRecipeSerializer(data=row)
+                if serializer.is_valid():
+                    yield serializer.validated_data
+                    continue
+                errors = serializer.errors
+
+            self.skipped += 1
+            self.stderr.write(f"Skipping line {line_number}: {errors}")
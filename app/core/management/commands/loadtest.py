@@ -0,0 +1,218 @@
+import http.client
+import itertools
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import orjson
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.authentication import issue_token
+from core.benchmarking import get_or_seed_user, percentile
+from core.models import Recipe, Tag
+
+BASELINE_SCENARIO = "cats hello"
+QUERIES = re.compile(r'(?:^|,\s*)db;[^,]*desc="(\d+)"')
+
+
+def build_scenarios(user, token):
+    auth = {"Authorization": f"Token {token}"}
+    json_body = {"Content-Type": "application/json"}
+    recipes_url = reverse("recipe:recipe-list")
+    recipe = Recipe.objects.filter(user=user).order_by("id").first()
+    tag = Tag.objects.filter(user=user).order_by("id").first()
+    word = recipe.title.split()[0] if recipe else "recipe"
+
+    scenarios = {
+        BASELINE_SCENARIO: ("GET", "/api/cats/hello", None, {}),
+        "cats greet": ("POST", "/api/cats/greet", {"name": "load"}, json_body),
+        "user token": (
+            "POST",
+            reverse("user:token"),
+            {"email": user.email, "password": "benchmark"},
+            json_body,
+        ),
+        "user me": ("GET", reverse("user:me"), None, auth),
+        "tag list": ("GET", reverse("recipe:tag-list"), None, auth),
+        "ingredient list": ("GET", reverse("recipe:ingredient-list"), None, auth),
+        "recipe list": ("GET", recipes_url, None, auth),
+        "recipe search": ("GET", f"{recipes_url}?{urlencode({'q': word})}", None, auth),
+    }
+    if recipe is not None:
+        detail_url = reverse("recipe:recipe-detail", args=[recipe.id])
+        scenarios["recipe detail"] = ("GET", detail_url, None, auth)
+    if tag is not None:
+        scenarios["recipes by tag"] = (
+            "GET",
+            f"{recipes_url}?tags={tag.id}",
+            None,
+            auth,
+        )
+    return scenarios
+
+
+def send(connection, method, path, body, headers):
+    start = time.perf_counter()
+    try:
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+    except (http.client.HTTPException, OSError):
+        connection.close()
+        return time.perf_counter() - start, 0, None
+
+    match = QUERIES.search(response.getheader("Server-Timing") or "")
+    queries = int(match.group(1)) if match else None
+    return time.perf_counter() - start, response.status, queries
+
+
+def run_scenario(base_url, scenario, requests, concurrency, timeout):
+    method, path, data, headers = scenario
+    body = orjson.dumps(data) if data is not None else None
+    url = urlsplit(base_url)
+    remaining = itertools.count()
+
+    def worker():
+        # One keep-alive connection per worker, like a pooled HTTP client
+        connection = http.client.HTTPConnection(url.hostname, url.port, timeout=timeout)
+        samples = []
+        try:
+            while next(remaining) < requests:
+                samples.append(send(connection, method, path, body, headers))
+        finally:
+            connection.close()
+        return samples
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+        samples = [sample for future in futures for sample in future.result()]
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _status, _queries in samples]
+    queries = [count for _latency, _status, count in samples if count is not None]
+    return {
+        "rps": len(samples) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "queries": sum(queries) / len(queries) if queries else None,
+        "errors": sum(1 for _latency, status, _q in samples if not 0 < status < 400),
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["p95"] > expected["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95'] * 1000:.2f}ms, "
+                f"baseline {expected['p95'] * 1000:.2f}ms"
+            )
+        if result["rps"] < expected["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['rps']:.0f} rps, baseline {expected['rps']:.0f} rps"
+            )
+        # Means vary a little between runs, e.g. with token cache misses
+        if (result["queries"] or 0) > (expected.get("queries") or 0) * (1 + tolerance):
+            regressions.append(
+                f"{name}: {result['queries']:.1f} queries per request, "
+                f"baseline {expected['queries'] or 0:.1f}"
+            )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests a running server (e.g. manage.py serve) with the same settings "
+        "and database: seeds a benchmark user, drives the cats, user and recipe "
+        "endpoints at a fixed concurrency and reports latency percentiles, RPS and "
+        "queries per request (from Server-Timing, so run the server with "
+        "PERFORMANCE_SAMPLE_RATE=1). 'cats hello' is the framework overhead "
+        "baseline. --baseline fails on regressions against a --save-baseline file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--email", default="benchmark@example.com")
+        parser.add_argument("--recipes", type=int, default=10000)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument("--ingredients", type=int, default=200)
+        parser.add_argument("--reseed", action="store_true")
+        parser.add_argument("--scenario", action="append", dest="scenarios")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--baseline")
+        parser.add_argument("--save-baseline")
+        parser.add_argument("--tolerance", type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        user = get_or_seed_user(
+            options["email"],
+            options["recipes"],
+            options["tags"],
+            options["ingredients"],
+            reseed=options["reseed"],
+        )
+        scenarios = build_scenarios(user, issue_token(user).key)
+        if options["scenarios"]:
+            unknown = set(options["scenarios"]) - set(scenarios)
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = {
+                name: scenario
+                for name, scenario in scenarios.items()
+                if name in options["scenarios"]
+            }
+
+        results = {}
+        for name, scenario in scenarios.items():
+            if options["warmup"]:
+                run_scenario(
+                    options["base_url"],
+                    scenario,
+                    options["warmup"],
+                    1,
+                    options["timeout"],
+                )
+            results[name] = run_scenario(
+                options["base_url"],
+                scenario,
+                options["requests"],
+                options["concurrency"],
+                options["timeout"],
+            )
+            self.report(name, results[name], results.get(BASELINE_SCENARIO))
+
+        if options["save_baseline"]:
+            with open(options["save_baseline"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"Saved baseline to {options['save_baseline']}")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+            regressions = find_regressions(results, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError("Regressions:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
+
+    def report(self, name, result, baseline):
+        queries = "n/a" if result["queries"] is None else f"{result['queries']:.1f}"
+        line = (
+            f"{name}: rps={result['rps']:.0f} p50={result['p50'] * 1000:.2f}ms "
+            f"p95={result['p95'] * 1000:.2f}ms p99={result['p99'] * 1000:.2f}ms "
+            f"queries={queries} errors={result['errors']}"
+        )
+        if baseline is not None and name != BASELINE_SCENARIO:
+            line += f" overhead_p50=+{(result['p50'] - baseline['p50']) * 1000:.2f}ms"
+        style = self.style.ERROR if result["errors"] else self.style.SUCCESS
+        self.stdout.write(style(line))
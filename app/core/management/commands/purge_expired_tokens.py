@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.authentication import expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Deletes auth tokens older than TOKEN_TTL. Meant to run periodically."
+
+    def handle(self, *args, **options):
+        deleted, _ = expired_tokens().delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired tokens"))
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts the production server under gunicorn, with one worker per "
+        "available core by default. Send SIGHUP to the master process to "
+        "gracefully reload workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bind", default=os.environ.get("SERVER_BIND", "0.0.0.0:8000")
+        )
+        parser.add_argument(
+            "--workers", type=int, default=int(os.environ.get("SERVER_WORKERS", 0))
+        )
+        parser.add_argument(
+            "--threads", type=int, default=int(os.environ.get("SERVER_THREADS", 4))
+        )
+        parser.add_argument("--asgi", action="store_true")
+        parser.add_argument("--reload", action="store_true")
+        parser.add_argument("--graceful-timeout", type=int, default=30)
+        parser.add_argument("--max-requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings.prod")
+        self.prepare_metrics_dir()
+
+        argv = self.get_gunicorn_argv(options)
+        self.stdout.write(f"Starting {' '.join(argv)}")
+        os.execvp(argv[0], argv)
+
+    def prepare_metrics_dir(self):
+        # Workers write their metrics there for any of them to add up, starting
+        # from zero like the processes of a fresh server
+        metrics_dir = Path(
+            os.environ.setdefault(
+                "METRICS_DIR", os.path.join(tempfile.gettempdir(), "app-metrics")
+            )
+        )
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        for path in metrics_dir.glob("*.json"):
+            path.unlink()
+
+    def get_gunicorn_argv(self, options):
+        workers = options["workers"] or available_cpus()
+        argv = [
+            "gunicorn",
+            "--bind",
+            options["bind"],
+            "--workers",
+            str(workers),
+            "--graceful-timeout",
+            str(options["graceful_timeout"]),
+            "--max-requests",
+            str(options["max_requests"]),
+            "--max-requests-jitter",
+            str(options["max_requests"] // 10),
+        ]
+        if options["asgi"]:
+            argv += ["--worker-class", "uvicorn.workers.UvicornWorker"]
+        else:
+            argv += ["--worker-class", "gthread", "--threads", str(options["threads"])]
+        if options["reload"]:
+            argv.append("--reload")
+
+        return argv + [
+            "app.asgi:application" if options["asgi"] else "app.wsgi:application"
+        ]
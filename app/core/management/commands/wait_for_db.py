@@ -1,19 +1,41 @@
 import time
 
-from django.core.management.base import BaseCommand
-from django.db import connections
+from django.core.management.base import BaseCommand, CommandError
 from django.db.utils import OperationalError
 
+from core.health import check_database
+
 
 class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--timeout", type=float, default=60)
+        parser.add_argument("--initial-delay", type=float, default=0.1)
+        parser.add_argument("--max-delay", type=float, default=5)
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for DB to become available...")
-        db_connection = None
-        while not db_connection:
+        start = time.monotonic()
+        delay = options["initial_delay"]
+        attempts = 1
+        while True:
             try:
-                db_connection = connections["default"]
+                check_database(options["database"])
+                break
             except OperationalError:
-                self.stdout.write("DB not yet available, waiting 1 second")
-                time.sleep(1)
+                elapsed = time.monotonic() - start
+                if elapsed + delay > options["timeout"]:
+                    raise CommandError(
+                        f"DB not available after {elapsed:.2f}s and {attempts} attempts"
+                    )
+                self.stdout.write(f"DB not yet available, waiting {delay:.2f} seconds")
+                time.sleep(delay)
+                delay = min(delay * 2, options["max_delay"])
+                attempts += 1
 
-        self.stdout.write(self.style.SUCCESS("DB available"))
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"DB available after {elapsed:.2f}s and {attempts} attempts"
+            )
+        )
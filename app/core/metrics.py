@@ -0,0 +1,156 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = {
+    "http_request_phase_seconds": (
+        "Time spent per request phase, by view.",
+        SECONDS_BUCKETS,
+    ),
+    "http_request_db_queries": (
+        "Database queries per request, by view.",
+        QUERY_BUCKETS,
+    ),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def add(self, counts, total, count):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+
+# Kept per process. With METRICS_DIR set, every worker also writes its series
+# to a file there, which render() adds up with those of the other workers,
+# including recycled ones, so totals only grow
+lock = threading.Lock()
+series = defaultdict(dict)
+flushed = {"at": 0.0, "pid": None}
+
+
+def get_histogram(series, name, key):
+    histogram = series[name].get(key)
+    if histogram is None:
+        histogram = series[name][key] = Histogram(HISTOGRAMS[name][1])
+    return histogram
+
+
+def observe(name, labels, value):
+    key = tuple(sorted(labels.items()))
+    with lock:
+        get_histogram(series, name, key).observe(value)
+        if (
+            settings.METRICS_DIR
+            and time.monotonic() - flushed["at"] >= settings.METRICS_FLUSH_SECONDS
+        ):
+            flush()
+
+
+def reset():
+    with lock:
+        series.clear()
+        flushed["at"] = 0.0
+
+
+def load(path, into):
+    try:
+        stored = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return
+    for name, entries in stored.items():
+        if name not in HISTOGRAMS:
+            continue
+        for labels, counts, total, count in entries:
+            key = tuple(tuple(pair) for pair in labels)
+            get_histogram(into, name, key).add(counts, total, count)
+
+
+def flush():
+    """Writes this process's series to METRICS_DIR, with the lock held."""
+    path = Path(settings.METRICS_DIR) / f"{os.getpid()}.json"
+    if flushed["pid"] != os.getpid():
+        # Carry on from a recycled worker that had the same pid, as replacing
+        # its file would make the totals go back
+        flushed["pid"] = os.getpid()
+        load(path, series)
+
+    stored = {
+        name: [
+            [key, histogram.counts, histogram.sum, histogram.count]
+            for key, histogram in histograms.items()
+        ]
+        for name, histograms in series.items()
+    }
+    partial = path.with_suffix(".tmp")
+    partial.write_text(json.dumps(stored))
+    os.replace(partial, path)
+    flushed["at"] = time.monotonic()
+
+
+def flush_at_exit():
+    with lock:
+        if settings.configured and settings.METRICS_DIR and series:
+            flush()
+
+
+atexit.register(flush_at_exit)
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def render():
+    if not settings.METRICS_DIR:
+        with lock:
+            return render_series(series)
+
+    with lock:
+        flush()
+    collected = defaultdict(dict)
+    for path in Path(settings.METRICS_DIR).glob("*.json"):
+        load(path, collected)
+    return render_series(collected)
+
+
+def render_series(series):
+    lines = []
+    for name, (description, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+        for labels, histogram in sorted(series[name].items()):
+            cumulative = 0
+            for bound, count in zip((*buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket{format_labels(labels, le=bound)} {cumulative}"
+                )
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,300 @@
+import asyncio
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from types import MethodType
+
+from django.conf import settings
+
+from core import metrics
+from core.db_routers import (
+    choose_replica,
+    get_sticky_cache,
+    read_replica,
+    stick_to_primary,
+    sticky_key,
+    stream_in_context,
+)
+from core.queries import QueryMonitor, get_query_budget
+
+current_timings = ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.durations = defaultdict(float)
+        self.running = set()
+        self.view_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.durations["db"] += time.perf_counter() - start
+
+    @contextmanager
+    def measure(self, name):
+        # Nested measurements of the same phase are counted once
+        if name in self.running:
+            yield
+            return
+
+        self.running.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += time.perf_counter() - start
+            self.running.discard(name)
+
+    def server_timing(self):
+        entries = [f'db;dur={self.durations["db"] * 1000:.2f};desc="{self.queries}"']
+        entries += [
+            f"{name};dur={duration * 1000:.2f}"
+            for name, duration in self.durations.items()
+            if name != "db"
+        ]
+        return ", ".join(entries)
+
+
+@contextmanager
+def timed(name):
+    timings = current_timings.get()
+    if timings is None:
+        yield
+    else:
+        with timings.measure(name):
+            yield
+
+
+query_observers = ContextVar("query_observers", default=())
+
+
+def observe_queries(execute, sql, params, many, context):
+    """Execute wrapper on every connection, running the current request's observers.
+
+    Found through the context, they also see the queries made from the threads
+    that sync views get under ASGI, without wrapping connections per request.
+    """
+    for observer in query_observers.get():
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+def install_query_observer(sender, connection, **kwargs):
+    if observe_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(observe_queries)
+
+
+@contextmanager
+def observing_queries(observer):
+    token = query_observers.set((*query_observers.get(), observer))
+    try:
+        yield
+    finally:
+        query_observers.reset(token)
+
+
+def on_event_loop(hook):
+    async def run(self, *args):
+        return hook(*args)
+
+    # Bound, as Django names the middleware of a hook by its __self__
+    return MethodType(run, hook.__self__)
+
+
+class SyncAndAsyncMiddleware:
+    """Runs natively under both WSGI and ASGI, without thread switches.
+
+    Subclasses implement handle() for sync chains and ahandle() for async ones.
+    Their process_view and process_template_response hooks must not do I/O, as
+    async chains call them on the event loop.
+    """
+
+    hooks = ("process_view", "process_template_response")
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Django checks this marker to tell async middleware instances apart
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+            # Django would otherwise run sync hooks through sync_to_async
+            for name in self.hooks:
+                if hasattr(self, name):
+                    setattr(self, name, on_event_loop(getattr(self, name)))
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.ahandle(request)
+        return self.handle(request)
+
+
+class PerformanceMiddleware(SyncAndAsyncMiddleware):
+    """Times sampled requests, sends a Server-Timing header and feeds metrics.
+
+    Phases are db (query time, with the query count as description), view,
+    serialize (wherever timed("serialize") is used), render and total.
+    """
+
+    def handle(self, request):
+        if random.random() >= settings.PERFORMANCE_SAMPLE_RATE:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with observing_queries(timings):
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings, start)
+
+    async def ahandle(self, request):
+        if random.random() >= settings.PERFORMANCE_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with observing_queries(timings):
+                response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings, start)
+
+    def finish(self, request, response, timings, start):
+        end = time.perf_counter()
+        if timings.view_started is not None and "view" not in timings.durations:
+            timings.durations["view"] = end - timings.view_started
+        timings.durations["total"] = end - start
+
+        response["Server-Timing"] = timings.server_timing()
+        self.record(request, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = current_timings.get()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = current_timings.get()
+        if timings is None or timings.view_started is None:
+            return response
+
+        start = time.perf_counter()
+        timings.durations["view"] = start - timings.view_started
+
+        def rendered(response):
+            timings.durations["render"] += time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def record(self, request, timings):
+        match = request.resolver_match
+        labels = {
+            "view": match.view_name if match else "unmatched",
+            "method": request.method,
+        }
+        for phase, duration in timings.durations.items():
+            metrics.observe(
+                "http_request_phase_seconds", {**labels, "phase": phase}, duration
+            )
+        metrics.observe("http_request_db_queries", labels, timings.queries)
+
+
+class QueryBudgetMiddleware(SyncAndAsyncMiddleware):
+    """Logs slow queries and checks the query_budgets views declare per action.
+
+    Requests over budget raise QueryBudgetExceeded with QUERY_BUDGET_STRICT, as
+    in tests, and are otherwise logged for QUERY_BUDGET_LOG_SAMPLE_RATE of them.
+    """
+
+    def handle(self, request):
+        monitor = request._query_monitor = QueryMonitor()
+        with observing_queries(monitor):
+            response = self.get_response(request)
+
+        monitor.check_budget()
+        return response
+
+    async def ahandle(self, request):
+        monitor = request._query_monitor = QueryMonitor()
+        with observing_queries(monitor):
+            response = await self.get_response(request)
+
+        monitor.check_budget()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        monitor = request._query_monitor
+        monitor.view, monitor.budget = get_query_budget(view_func, request.method)
+
+
+class ReplicaMiddleware(SyncAndAsyncMiddleware):
+    """Sends reads of safe requests to a replica, see core.db_routers.
+
+    Clients, told apart by Authorization header or address, read from the
+    primary for REPLICA_STICKY_SECONDS after an unsafe request so they see
+    their own writes. core.views.StickyReadsMixin does the same per user.
+    Without DATABASE_REPLICAS the sticky cache is left alone.
+    """
+
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def handle(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = sticky_key(request)
+        safe = request.method in self.safe_methods
+        replica = None
+        if safe and not (key and get_sticky_cache().get(key)):
+            replica = choose_replica()
+
+        token = read_replica.set(replica)
+        try:
+            response = self.read_streams_from_replica(self.get_response(request))
+        finally:
+            read_replica.reset(token)
+
+        if not safe and key:
+            stick_to_primary(key)
+        return response
+
+    async def ahandle(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        key = sticky_key(request)
+        safe = request.method in self.safe_methods
+        replica = None
+        if safe and not (key and await get_sticky_cache().aget(key)):
+            replica = choose_replica()
+
+        token = read_replica.set(replica)
+        try:
+            response = self.read_streams_from_replica(await self.get_response(request))
+        finally:
+            read_replica.reset(token)
+
+        if not safe and key:
+            await get_sticky_cache().aset(key, True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    def read_streams_from_replica(self, response):
+        if response.streaming and read_replica.get():
+            response.streaming_content = stream_in_context(response.streaming_content)
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 4.0 on 2026-10-18 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_auto_20211213_1109"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ingredient",
+            index=models.Index(
+                fields=["user", "-name", "-id"], name="core_ingredient_user_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["user", "-title", "-id"], name="core_recipe_user_title_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "-name", "-id"], name="core_tag_user_name_idx"
+            ),
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX core_recipe_ingredients_rev_idx "
+            "ON core_recipe_ingredients (ingredient_id, recipe_id)",
+            "DROP INDEX core_recipe_ingredients_rev_idx",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX core_recipe_tags_rev_idx ON core_recipe_tags (tag_id, recipe_id)",
+            "DROP INDEX core_recipe_tags_rev_idx",
+        ),
+    ]
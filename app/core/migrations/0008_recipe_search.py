@@ -0,0 +1,65 @@
+# Generated by Django 4.0 on 2026-10-18 10:30
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+
+def populate_search(apps, schema_editor):
+    Recipe = apps.get_model("core", "Recipe")
+    recipes = Recipe.objects.using(schema_editor.connection.alias)
+    ids = list(recipes.values_list("pk", flat=True))
+    for start in range(0, len(ids), 1000):
+        batch = list(
+            recipes.filter(pk__in=ids[start : start + 1000]).prefetch_related(
+                "tags", "ingredients"
+            )
+        )
+        for recipe in batch:
+            recipe.search_text = " ".join(
+                [tag.name for tag in recipe.tags.all()]
+                + [ingredient.name for ingredient in recipe.ingredients.all()]
+            )
+        recipes.bulk_update(batch, ["search_text"])
+
+    if schema_editor.connection.vendor == "postgresql":
+        recipes.update(
+            search_vector=SearchVector("title", weight="A", config="english")
+            + SearchVector(
+                Coalesce("search_text", Value("")), weight="B", config="english"
+            )
+        )
+        schema_editor.execute(
+            "CREATE INDEX core_recipe_search_vector_idx "
+            "ON core_recipe USING gin (search_vector)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX core_recipe_search_vector_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="search_text",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(populate_search, drop_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.0 on 2026-10-18 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_recipe_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["user", "updated_at"], name="core_recipe_user_updated_idx"
+            ),
+        ),
+    ]
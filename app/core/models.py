@@ -4,6 +4,7 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
@@ -44,6 +45,14 @@ class Tag(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-name", "-id"], name="core_tag_user_name_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -52,6 +61,14 @@ class Tag(models.Model):
 class Ingredient(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-name", "-id"], name="core_ingredient_user_name_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -65,6 +82,21 @@ class Recipe(models.Model):
     ingredients = models.ManyToManyField(Ingredient)
     tags = models.ManyToManyField(Tag)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_text = models.TextField(blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-title", "-id"], name="core_recipe_user_title_idx"
+            ),
+            # Covers the count and latest update of a user's recipes, see
+            # RecipeView.list
+            models.Index(
+                fields=["user", "updated_at"], name="core_recipe_user_updated_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,90 @@
+import logging
+import random
+import sysconfig
+import time
+import traceback
+
+from django.conf import settings
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+LIBRARY_PATHS = tuple(
+    {sysconfig.get_paths()[name] for name in ("stdlib", "purelib", "platlib")}
+)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_query_budget(view_func, method):
+    """Returns (label, budget) for views declaring query_budgets per action.
+
+    Viewsets key budgets by action name, plain API views by HTTP method.
+    """
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return getattr(view_func, "__qualname__", str(view_func)), None
+
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(method.lower(), method.lower())
+    budgets = getattr(view_class, "query_budgets", {})
+    return f"{view_class.__name__}.{action}", budgets.get(action)
+
+
+def current_serializer():
+    for frame, _line in traceback.walk_stack(None):
+        candidate = frame.f_locals.get("self")
+        if isinstance(candidate, BaseSerializer):
+            return type(candidate).__name__
+    return None
+
+
+def project_stack():
+    return "".join(
+        traceback.format_list(
+            frame
+            for frame in traceback.extract_stack()[:-3]
+            if not frame.filename.startswith(LIBRARY_PATHS)
+        )
+    )
+
+
+class QueryMonitor:
+    """Execute wrapper counting queries and logging the slow ones."""
+
+    def __init__(self, view="-", budget=None):
+        self.view = view
+        self.budget = budget
+        self.queries = 0
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_MS
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            duration_ms = (time.perf_counter() - start) * 1000
+            if self.threshold is not None and duration_ms >= self.threshold:
+                logger.warning(
+                    "Slow query (%.1fms) in %s, serializer %s: %s\n%s",
+                    duration_ms,
+                    self.view,
+                    current_serializer() or "-",
+                    sql,
+                    project_stack(),
+                )
+
+    def check_budget(self):
+        if self.budget is None or self.queries <= self.budget:
+            return
+
+        message = (
+            f"{self.view} ran {self.queries} queries, over its budget of {self.budget}"
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        if random.random() < settings.QUERY_BUDGET_LOG_SAMPLE_RATE:
+            logger.warning(message)
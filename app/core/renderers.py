@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+fallback_encoder = JSONEncoder()
+
+
+def default(obj):
+    # Keep decimals exact instead of DRF's float coercion
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return fallback_encoder.default(obj)
+
+
+def dumps(data, indent=None):
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=default, option=option)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=indent)
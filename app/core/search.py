@@ -0,0 +1,53 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, Prefetch, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from core.models import Ingredient, Recipe, Tag
+
+SEARCH_CONFIG = "english"
+
+
+def search_vector():
+    return SearchVector("title", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        Coalesce("search_text", Value("")), weight="B", config=SEARCH_CONFIG
+    )
+
+
+def refresh_search(recipe_ids):
+    recipes = list(
+        Recipe.objects.filter(pk__in=recipe_ids)
+        .only("id")
+        .prefetch_related(
+            Prefetch("tags", queryset=Tag.objects.only("id", "name")),
+            Prefetch("ingredients", queryset=Ingredient.objects.only("id", "name")),
+        )
+    )
+    for recipe in recipes:
+        recipe.search_text = " ".join(
+            [tag.name for tag in recipe.tags.all()]
+            + [ingredient.name for ingredient in recipe.ingredients.all()]
+        )
+    Recipe.objects.bulk_update(recipes, ["search_text"], batch_size=1000)
+    refresh_search_vector(recipe_ids)
+
+
+def refresh_search_vector(recipe_ids):
+    if connection.vendor == "postgresql":
+        Recipe.objects.filter(pk__in=recipe_ids).update(search_vector=search_vector())
+
+
+def search_recipes(queryset, text):
+    if connection.vendor == "postgresql":
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+
+    rank = Value(0.0)
+    for term in text.split():
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(search_text__icontains=term)
+        )
+        rank += Case(When(title__icontains=term, then=Value(1.0)), default=Value(0.0))
+    return queryset.annotate(rank=rank)
@@ -0,0 +1,18 @@
+from core.middleware import timed
+
+
+class TimedSerializerMixin:
+    """Counts validation and representation towards the serialize phase.
+
+    For views going through DRF's generic mixins, which call is_valid() and
+    read .data themselves.
+    """
+
+    def is_valid(self, *args, **kwargs):
+        with timed("serialize"):
+            return super().is_valid(*args, **kwargs)
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.authentication import forget_tokens
+from core.models import Ingredient, Recipe, Tag
+from core.search import refresh_search, refresh_search_vector
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    forget_tokens(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def forget_updated_user_tokens(sender, instance, created, **kwargs):
+    if not created:
+        forget_tokens(
+            *Token.objects.filter(user=instance).values_list("key", flat=True)
+        )
+
+
+def linked_recipe_ids(instance):
+    relation = Recipe.tags if isinstance(instance, Tag) else Recipe.ingredients
+    links = relation.through.objects.filter(**{instance._meta.model_name: instance})
+    return list(links.values_list("recipe_id", flat=True))
+
+
+pending_recipe_changes = ContextVar("pending_recipe_changes", default=None)
+
+
+@contextmanager
+def deferred_recipe_changes():
+    """Collects recipe saves and relation changes, then refreshes them once.
+
+    Saving a recipe and setting its tags and ingredients sends several
+    signals, each of which would otherwise touch and reindex the recipe.
+    """
+    if pending_recipe_changes.get() is not None:
+        yield
+        return
+
+    saved, changed = set(), set()
+    token = pending_recipe_changes.set((saved, changed))
+    try:
+        yield
+    finally:
+        pending_recipe_changes.reset(token)
+
+    if changed - saved:
+        Recipe.objects.filter(pk__in=changed - saved).update(updated_at=timezone.now())
+    if changed:
+        refresh_search(changed)
+    if saved - changed:
+        refresh_search_vector(saved - changed)
+
+
+def recipes_changed(recipe_ids):
+    pending = pending_recipe_changes.get()
+    if pending is not None:
+        pending[1].update(recipe_ids)
+        return
+
+    Recipe.objects.filter(pk__in=recipe_ids).update(updated_at=timezone.now())
+    refresh_search(recipe_ids)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def recipe_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._cleared_recipe_ids = linked_recipe_ids(instance)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        if not reverse:
+            recipe_ids = [instance.pk]
+        elif action == "post_clear":
+            recipe_ids = instance.__dict__.pop("_cleared_recipe_ids", [])
+        else:
+            recipe_ids = pk_set
+        recipes_changed(recipe_ids)
+
+
+@receiver(post_save, sender=Recipe)
+def refresh_recipe_search_vector(sender, instance, update_fields, **kwargs):
+    if update_fields is None or "title" in update_fields:
+        pending = pending_recipe_changes.get()
+        if pending is not None:
+            pending[0].add(instance.pk)
+        else:
+            refresh_search_vector([instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def refresh_search_of_linked_recipes(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search(linked_recipe_ids(instance))
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Ingredient)
+def remember_linked_recipes(sender, instance, **kwargs):
+    instance._deleted_recipe_ids = linked_recipe_ids(instance)
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def linked_recipes_changed(sender, instance, **kwargs):
+    recipes_changed(instance.__dict__.pop("_deleted_recipe_ids", []))
@@ -0,0 +1,66 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import CachedTokenAuthentication, get_token_cache
+
+ME_URL = reverse("user:me")
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "irrelevant", name="name"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_second_lookup_does_not_hit_the_database(self):
+        self.auth.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_deleted_token_is_no_longer_accepted(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_is_no_longer_accepted(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    @override_settings(TOKEN_TTL=60)
+    def test_expired_token_is_no_longer_accepted(self):
+        self.auth.authenticate_credentials(self.token.key)
+        later = timezone.now() + timedelta(minutes=5)
+
+        with patch("django.utils.timezone.now", return_value=later):
+            with self.assertRaises(exceptions.AuthenticationFailed):
+                self.auth.authenticate_credentials(self.token.key)
+
+    def test_user_updates_through_the_api_are_visible_on_the_next_request(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        client.patch(ME_URL, {"name": "new name"})
+        res = client.get(ME_URL)
+
+        self.assertEqual(res.data["name"], "new name")
@@ -1,20 +1,216 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
 from unittest.mock import patch
 
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.db.utils import OperationalError
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.models import Ingredient, Recipe, Tag
+from core.tests.test_models import sample_user
 
 
 class CommandTest(TestCase):
     def test_wait_for_db_to_be_ready(self):
-        with patch("django.db.utils.ConnectionHandler.__getitem__") as gi:
-            gi.return_value = True
-            call_command("wait_for_db")
-            self.assertTrue(gi.call_count, 1)
+        with patch("core.management.commands.wait_for_db.check_database") as check:
+            call_command("wait_for_db", stdout=StringIO())
+            self.assertEqual(check.call_count, 1)
+
+    @patch("time.sleep", return_value=True)
+    def test_tries_5_times_and_stops(self, sleep):
+        with patch("core.management.commands.wait_for_db.check_database") as check:
+            check.side_effect = [OperationalError] * 5 + [None]
+            call_command("wait_for_db", stdout=StringIO())
+            self.assertEqual(check.call_count, 6)
+            delays = [call.args[0] for call in sleep.call_args_list]
+            self.assertEqual(delays, [0.1, 0.2, 0.4, 0.8, 1.6])
 
     @patch("time.sleep", return_value=True)
-    def test_tries_5_times_and_stops(self, _ts):
-        with patch("django.db.utils.ConnectionHandler.__getitem__") as gi:
-            gi.side_effect = [OperationalError] * 5 + [True]
-            call_command("wait_for_db")
-            self.assertTrue(gi.call_count, 6)
+    def test_wait_for_db_gives_up_after_the_deadline(self, _ts):
+        with patch("core.management.commands.wait_for_db.check_database") as check:
+            check.side_effect = OperationalError
+            with self.assertRaises(CommandError):
+                call_command("wait_for_db", timeout=0.5, stdout=StringIO())
+
+    def test_wait_for_db_runs_a_query(self):
+        out = StringIO()
+        with self.assertNumQueries(1):
+            call_command("wait_for_db", stdout=out)
+        self.assertIn("DB available after", out.getvalue())
+
+    def test_benchmark_queries_seeds_and_reports_every_query(self):
+        out = StringIO()
+        call_command(
+            "benchmark_queries", recipes=20, tags=5, ingredients=5, repeat=2, stdout=out
+        )
+
+        self.assertEqual(Recipe.objects.count(), 20)
+        self.assertEqual(Recipe.tags.through.objects.count(), 60)
+        for name in (
+            "tag list",
+            "recipe list",
+            "recipes by tag",
+            "recipes with all tags",
+        ):
+            self.assertIn(f"{name}: mean=", out.getvalue())
+
+    def test_benchmark_serializers_reports_matching_outputs(self):
+        out, err = StringIO(), StringIO()
+        call_command(
+            "benchmark_serializers",
+            recipes=20,
+            tags=5,
+            ingredients=5,
+            repeat=2,
+            stdout=out,
+            stderr=err,
+        )
+
+        self.assertEqual(err.getvalue(), "")
+        for name in ("tag list", "ingredient list", "recipe list"):
+            self.assertIn(f"{name} values: mean=", out.getvalue())
+            self.assertIn(f"{name}: ", out.getvalue())
+
+    @patch("os.execvp")
+    @patch("core.management.commands.serve.Command.prepare_metrics_dir")
+    def test_serve_starts_threaded_gunicorn_workers(self, _metrics_dir, execvp):
+        call_command("serve", workers=3, threads=8, stdout=StringIO())
+
+        program, argv = execvp.call_args[0]
+        self.assertEqual(program, "gunicorn")
+        self.assertIn("--workers 3", " ".join(argv))
+        self.assertIn("--worker-class gthread --threads 8", " ".join(argv))
+        self.assertEqual(argv[-1], "app.wsgi:application")
+
+    @patch("os.execvp")
+    @patch("core.management.commands.serve.Command.prepare_metrics_dir")
+    @patch("core.management.commands.serve.available_cpus", return_value=6)
+    def test_serve_sizes_asgi_workers_to_the_available_cores(
+        self, _cpus, _metrics_dir, execvp
+    ):
+        call_command("serve", asgi=True, stdout=StringIO())
+
+        _program, argv = execvp.call_args[0]
+        self.assertIn("--workers 6", " ".join(argv))
+        self.assertIn("uvicorn.workers.UvicornWorker", argv)
+        self.assertEqual(argv[-1], "app.asgi:application")
+
+    @patch("os.execvp")
+    def test_serve_empties_the_metrics_dir_of_the_last_run(self, _execvp):
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            stale = Path(metrics_dir) / "123.json"
+            stale.write_text("{}")
+
+            with patch.dict("os.environ", {"METRICS_DIR": metrics_dir}):
+                call_command("serve", stdout=StringIO())
+
+            self.assertFalse(stale.exists())
+
+    def test_benchmark_connections_reports_both_modes(self):
+        out = StringIO()
+        call_command("benchmark_connections", requests=3, stdout=out)
+
+        self.assertIn("new connection per request: mean=", out.getvalue())
+        self.assertIn("persistent connection: mean=", out.getvalue())
+
+    def test_benchmark_hashers_reports_a_rate_per_hasher(self):
+        out = StringIO()
+        call_command("benchmark_hashers", hashers=["md5"], seconds=0.01, stdout=out)
+
+        self.assertIn("md5: ", out.getvalue())
+        self.assertIn("hashes/s per core", out.getvalue())
+
+    @override_settings(TOKEN_TTL=60)
+    def test_purge_expired_tokens_keeps_fresh_ones(self):
+        fresh = Token.objects.create(user=sample_user("fresh@test.com"))
+        expired = Token.objects.create(user=sample_user("expired@test.com"))
+        Token.objects.filter(pk=expired.pk).update(
+            created=timezone.now() - timedelta(minutes=5)
+        )
+
+        call_command("purge_expired_tokens", stdout=StringIO())
+
+        self.assertEqual(list(Token.objects.all()), [fresh])
+
+    def test_benchmark_startup_serves_requests_with_the_api_profile(self):
+        out = StringIO()
+        call_command(
+            "benchmark_startup",
+            profiles=["api"],
+            path="/health/live/",
+            repeat=2,
+            runs=1,
+            stdout=out,
+        )
+
+        self.assertIn("/health/live/ answered 200 OK", out.getvalue())
+        self.assertIn("api django setup: mean=", out.getvalue())
+        self.assertIn("api per request: mean=", out.getvalue())
+
+    def test_benchmark_json_compares_both_implementations(self):
+        out = StringIO()
+        call_command("benchmark_json", recipes=5, repeat=2, stdout=out)
+
+        for label in ("stdlib render", "orjson render", "orjson parse"):
+            self.assertIn(label, out.getvalue())
+
+    def test_import_recipes_from_json_lines_reuses_existing_names(self):
+        user = sample_user()
+        existing = Tag.objects.create(user=user, name="vegan")
+        lines = [
+            '{"title": "Soup", "time_minutes": 10, "price": "2.50", '
+            '"tags": ["vegan", "warm"], "ingredients": ["leek"]}',
+            '{"title": "Salad", "time_minutes": 5, "price": "3.00", '
+            '"tags": ["vegan"], "ingredients": ["leek", "kale"]}',
+            '{"title": "Broken", "price": "nope"}',
+            "not json",
+        ]
+        out, err = StringIO(), StringIO()
+
+        with patch("sys.stdin", StringIO("\n".join(lines))):
+            call_command(
+                "import_recipes",
+                "-",
+                email=user.email,
+                batch_size=1,
+                stdout=out,
+                stderr=err,
+            )
+
+        self.assertIn("Imported 2 recipes", out.getvalue())
+        self.assertIn("skipped 2 invalid rows", out.getvalue())
+        self.assertIn("Skipping line 3", err.getvalue())
+        self.assertIn("Skipping line 4", err.getvalue())
+        self.assertEqual(Tag.objects.filter(user=user).count(), 2)
+        self.assertEqual(Ingredient.objects.filter(user=user).count(), 2)
+        salad = Recipe.objects.get(title="Salad")
+        self.assertEqual(list(salad.tags.all()), [existing])
+        self.assertEqual(salad.ingredients.count(), 2)
+        self.assertIn("leek", salad.search_text)
+
+    def test_import_recipes_from_csv(self):
+        user = sample_user()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(
+                "title,time_minutes,price,link,tags,ingredients\n"
+                "Toast,3,1.20,,breakfast,bread|butter\n"
+            )
+            file.flush()
+            call_command(
+                "import_recipes", file.name, email=user.email, stdout=StringIO()
+            )
+
+        toast = Recipe.objects.get(user=user)
+        self.assertEqual(
+            sorted(toast.ingredients.values_list("name", flat=True)),
+            ["bread", "butter"],
+        )
+        self.assertEqual(list(toast.tags.values_list("name", flat=True)), ["breakfast"])
+
+    def test_import_recipes_requires_an_existing_user(self):
+        with self.assertRaises(CommandError):
+            call_command("import_recipes", "-", email="nobody@test.com")
@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from core.backends.postgresql.base import DatabaseWrapper
+from core.db import check_persistent_connections
+
+
+def fake_connection(open=True, health_checks=True):
+    connection = MagicMock()
+    connection.connection = MagicMock() if open else None
+    connection.settings_dict = {"CONN_HEALTH_CHECKS": health_checks}
+    connection.health_check_pending = False
+    return connection
+
+
+@patch("core.db.connections")
+class PersistentConnectionCheckTests(SimpleTestCase):
+    def test_checks_persistent_connections_on_their_next_use(self, connections):
+        connection = fake_connection()
+        connections.all.return_value = [connection]
+
+        check_persistent_connections()
+
+        self.assertTrue(connection.health_check_pending)
+        connection.is_usable.assert_not_called()
+
+    def test_skips_closed_connections(self, connections):
+        connection = fake_connection(open=False)
+        connections.all.return_value = [connection]
+
+        check_persistent_connections()
+
+        self.assertFalse(connection.health_check_pending)
+
+    def test_skips_checks_unless_enabled(self, connections):
+        connection = fake_connection(health_checks=False)
+        connections.all.return_value = [connection]
+
+        check_persistent_connections()
+
+        self.assertFalse(connection.health_check_pending)
+
+
+@patch.object(DatabaseWrapper, "connect")
+class HealthCheckOnFirstUseTests(SimpleTestCase):
+    def persistent_connection(self, usable):
+        wrapper = DatabaseWrapper({"CONN_HEALTH_CHECKS": True})
+        wrapper.connection = MagicMock()
+        wrapper.is_usable = MagicMock(return_value=usable)
+        wrapper.close = MagicMock(
+            side_effect=lambda: setattr(wrapper, "connection", None)
+        )
+        wrapper.health_check_pending = True
+        return wrapper
+
+    def test_reconnects_when_broken(self, connect):
+        wrapper = self.persistent_connection(usable=False)
+
+        wrapper.ensure_connection()
+
+        wrapper.close.assert_called_once()
+        connect.assert_called_once()
+
+    def test_pings_once_per_request(self, connect):
+        wrapper = self.persistent_connection(usable=True)
+
+        wrapper.ensure_connection()
+        wrapper.ensure_connection()
+
+        wrapper.is_usable.assert_called_once()
+        wrapper.close.assert_not_called()
+        connect.assert_not_called()
+
+    def test_does_not_ping_without_a_pending_check(self, connect):
+        wrapper = self.persistent_connection(usable=False)
+        wrapper.health_check_pending = False
+
+        wrapper.ensure_connection()
+
+        wrapper.is_usable.assert_not_called()
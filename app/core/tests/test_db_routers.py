@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import get_token_cache, token_cache_key
+from core.db_routers import ReplicaRouter, get_sticky_cache
+from core.models import Recipe, Tag
+
+TAGS_URL = reverse("recipe:tag-list")
+TOKEN_URL = reverse("user:token")
+RECIPES_EXPORT_URL = reverse("recipe:recipe-export")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], CACHE_LISTS=False)
+class ReplicaRoutingTests(TestCase):
+    # The test replica never receives writes, so reads from it come back empty
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "pass")
+        Tag.objects.create(user=self.user, name="vegan")
+        self.other_user = get_user_model().objects.create_user("other@test.com", "x")
+        Tag.objects.create(user=self.other_user, name="quick")
+        self.client = self.client_for("Token first")
+        cache.clear()
+        get_token_cache().clear()
+
+    def client_for(self, authorization, user=None):
+        client = APIClient()
+        client.force_authenticate(user=user or self.user)
+        client.credentials(HTTP_AUTHORIZATION=authorization)
+        return client
+
+    def tag_names(self, client, **params):
+        res = client.get(TAGS_URL, params)
+        return [tag["name"] for tag in res.data["results"]]
+
+    def test_safe_requests_read_from_a_replica(self):
+        self.assertEqual(self.tag_names(self.client), [])
+
+    def test_clients_read_their_own_writes_from_the_primary(self):
+        self.client.post(TAGS_URL, {"name": "quick"})
+
+        self.assertEqual(self.tag_names(self.client), ["vegan", "quick"])
+        other_client = self.client_for("Token second", user=self.other_user)
+        self.assertEqual(self.tag_names(other_client), [])
+
+    def test_other_clients_of_the_same_user_read_from_the_primary(self):
+        self.client.post(TAGS_URL, {"name": "quick"})
+
+        # A different page size skips the cached list of the same user
+        second_client = self.client_for("Token second")
+        self.assertEqual(
+            self.tag_names(second_client, page_size=10), ["vegan", "quick"]
+        )
+
+    def test_new_tokens_are_read_from_the_primary(self):
+        res = APIClient().post(
+            TOKEN_URL, {"email": "test@test.com", "password": "pass"}
+        )
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {res.data['token']}")
+        self.assertEqual(self.tag_names(client), ["vegan"])
+
+    def test_streamed_responses_read_from_the_replica(self):
+        Recipe.objects.create(user=self.user, title="toast", time_minutes=5, price=1)
+
+        res = self.client.get(RECIPES_EXPORT_URL)
+
+        self.assertEqual(b"".join(res.streaming_content), b"[]")
+
+    def test_clients_go_back_to_replicas_after_the_sticky_window(self):
+        self.client.post(TAGS_URL, {"name": "quick"})
+        get_sticky_cache().clear()
+
+        self.assertEqual(self.tag_names(self.client), [])
+
+    def test_cached_credentials_are_read_from_the_primary(self):
+        token = Token.objects.create(user=self.user)
+        # The replica lags behind, still holding the user as active
+        get_user_model().objects.using("replica").create(
+            pk=self.user.pk, email=self.user.email, password=self.user.password
+        )
+        Token.objects.using("replica").create(key=token.key, user_id=self.user.pk)
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        self.assertEqual(client.get(TAGS_URL).status_code, 401)
+        self.assertIsNone(get_token_cache().get(token_cache_key(token.key)))
+
+    @override_settings(CACHE_LISTS=True)
+    def test_cached_lists_are_read_from_the_primary(self):
+        get_user_model().objects.using("replica").create(
+            pk=self.user.pk, email=self.user.email
+        )
+        Tag.objects.using("replica").create(user_id=self.user.pk, name="stale")
+
+        self.assertEqual(self.tag_names(self.client), ["vegan"])
+        self.assertEqual(self.tag_names(self.client), ["vegan"])
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(ReplicaRouter().db_for_read(Tag), "default")
+        self.assertEqual(Tag.objects.count(), 2)
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+ARGON2_HASHERS = [
+    "core.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+
+@override_settings(
+    PASSWORD_HASHERS=ARGON2_HASHERS,
+    ARGON2_TIME_COST=1,
+    ARGON2_MEMORY_COST=1024,
+    ARGON2_PARALLELISM=1,
+)
+class TunedArgon2PasswordHasherTests(TestCase):
+    def test_uses_the_configured_cost_parameters(self):
+        self.assertIn("$m=1024,t=1,p=1$", make_password("irrelevant"))
+
+    def test_outdated_hashes_are_upgraded_on_login(self):
+        with override_settings(PASSWORD_HASHERS=ARGON2_HASHERS[::-1]):
+            user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.assertTrue(user.password.startswith("md5$"))
+
+        self.client.post(
+            reverse("user:token"), {"email": user.email, "password": "irrelevant"}
+        )
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2$"))
+
+    def test_changed_cost_parameters_are_applied_on_login(self):
+        user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+
+        with override_settings(ARGON2_TIME_COST=2):
+            self.assertTrue(user.check_password("irrelevant"))
+
+        user.refresh_from_db()
+        self.assertIn(",t=2,", user.password)
@@ -0,0 +1,26 @@
+from unittest.mock import patch
+
+from django.db.utils import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+LIVE_URL = reverse("core:live")
+READY_URL = reverse("core:ready")
+
+
+class HealthEndpointsTests(TestCase):
+    def test_live_does_not_touch_the_database(self):
+        with self.assertNumQueries(0):
+            res = self.client.get(LIVE_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_ready_when_the_database_answers(self):
+        res = self.client.get(READY_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("db_ms", res.json())
+
+    @patch("core.views.check_database", side_effect=OperationalError)
+    def test_not_ready_when_the_database_is_down(self, _check):
+        res = self.client.get(READY_URL)
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
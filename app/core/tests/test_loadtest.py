@@ -0,0 +1,72 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from core.management.commands.loadtest import find_regressions
+
+SCENARIOS = ["cats hello", "user token", "recipe list"]
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    def loadtest(self, **options):
+        out = StringIO()
+        options = {"scenarios": SCENARIOS, **options}
+        call_command(
+            "loadtest",
+            base_url=self.live_server_url,
+            recipes=5,
+            tags=2,
+            ingredients=2,
+            requests=4,
+            concurrency=2,
+            warmup=1,
+            stdout=out,
+            **options,
+        )
+        return out.getvalue()
+
+    def test_reports_every_scenario_and_saves_a_baseline(self):
+        with tempfile.NamedTemporaryFile("r", suffix=".json") as baseline:
+            out = self.loadtest(save_baseline=baseline.name)
+            saved = json.load(baseline)
+
+        for name in SCENARIOS:
+            self.assertIn(f"{name}: rps=", out)
+        self.assertIn("overhead_p50=", out)
+        self.assertEqual(set(saved), set(SCENARIOS))
+        self.assertEqual(saved["cats hello"]["queries"], 0)
+        self.assertEqual(saved["recipe list"]["errors"], 0)
+
+    def test_fails_when_slower_than_the_baseline(self):
+        fast = {"rps": 10 ** 9, "p50": 0, "p95": 0, "p99": 0, "queries": 0}
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as baseline:
+            json.dump({name: fast for name in SCENARIOS}, baseline)
+            baseline.flush()
+            with self.assertRaisesMessage(CommandError, "recipe list: p95"):
+                self.loadtest(baseline=baseline.name)
+
+    def test_rejects_unknown_scenarios(self):
+        with self.assertRaises(CommandError):
+            self.loadtest(scenarios=["nope"])
+
+
+class FindRegressionsTests(SimpleTestCase):
+    def test_flags_extra_queries(self):
+        result = {"rps": 100, "p95": 0.01, "queries": 3}
+        baseline = {"rps": 100, "p95": 0.01, "queries": 2}
+
+        self.assertEqual(
+            find_regressions({"tag list": result}, {"tag list": baseline}, 0.2),
+            ["tag list: 3.0 queries per request, baseline 2.0"],
+        )
+
+    def test_tolerates_small_changes_in_mean_queries(self):
+        result = {"rps": 100, "p95": 0.01, "queries": 2.01}
+        baseline = {"rps": 100, "p95": 0.01, "queries": 2}
+
+        self.assertEqual(
+            find_regressions({"tag list": result}, {"tag list": baseline}, 0.2), []
+        )
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.middleware import (
+    PerformanceMiddleware,
+    QueryBudgetMiddleware,
+    ReplicaMiddleware,
+    RequestTimings,
+    timed,
+)
+from core.models import Recipe
+
+TAGS_URL = reverse("recipe:tag-list")
+TOKEN_URL = reverse("user:token")
+METRICS_URL = reverse("metrics")
+
+
+def server_timing(response):
+    entries = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        entries[name] = dict(param.split("=", 1) for param in params)
+    return entries
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        cache.clear()
+        metrics.reset()
+
+    def test_sends_server_timing_for_every_phase(self):
+        res = self.client.get(TAGS_URL)
+
+        timing = server_timing(res)
+        self.assertEqual(set(timing), {"db", "view", "serialize", "render", "total"})
+        self.assertEqual(timing["db"]["desc"], '"1"')
+
+    def test_counts_cached_responses_without_queries(self):
+        self.client.get(TAGS_URL)
+        res = self.client.get(TAGS_URL)
+
+        timing = server_timing(res)
+        self.assertEqual(timing["db"]["desc"], '"0"')
+        self.assertNotIn("serialize", timing)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0)
+    def test_skips_unsampled_requests(self):
+        res = self.client.get(TAGS_URL)
+
+        self.assertFalse(res.has_header("Server-Timing"))
+        self.assertNotIn("recipe:tag-list", metrics.render())
+
+    def test_times_serializers_of_generic_views(self):
+        recipe = Recipe.objects.create(
+            user=self.user, title="toast", time_minutes=5, price=1
+        )
+
+        res = self.client.get(reverse("recipe:recipe-detail", args=[recipe.id]))
+        self.assertIn("serialize", server_timing(res))
+
+        res = APIClient().post(
+            TOKEN_URL, {"email": "test@test.com", "password": "irrelevant"}
+        )
+        self.assertIn("serialize", server_timing(res))
+
+    @override_settings(METRICS_TOKEN="scraper")
+    def test_exposes_per_view_histograms(self):
+        self.client.get(TAGS_URL)
+        self.client.get(TAGS_URL)
+
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer scraper")
+
+        self.assertEqual(res["Content-Type"], "text/plain; version=0.0.4")
+        body = res.content.decode()
+        self.assertIn("# TYPE http_request_phase_seconds histogram", body)
+        self.assertIn(
+            'http_request_phase_seconds_count{method="GET",phase="total",'
+            'view="recipe:tag-list"} 2',
+            body,
+        )
+        self.assertIn(
+            'http_request_db_queries_bucket{method="GET",view="recipe:tag-list",'
+            'le="+Inf"} 2',
+            body,
+        )
+
+
+class MetricsTests(TestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_is_not_served_without_a_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 404)
+
+    @override_settings(METRICS_TOKEN="scraper")
+    def test_needs_the_scraper_token(self):
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer other")
+
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(res["WWW-Authenticate"], "Bearer")
+
+    def test_adds_up_the_metrics_of_every_worker(self):
+        labels = {"method": "GET", "view": "recipe:tag-list"}
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            # Left by a worker since recycled
+            Path(metrics_dir, "1.json").write_text(
+                json.dumps(
+                    {
+                        "http_request_db_queries": [
+                            [
+                                sorted(labels.items()),
+                                [0, 2, 0, 0, 0, 0, 0, 0, 0, 0],
+                                2,
+                                2,
+                            ]
+                        ]
+                    }
+                )
+            )
+
+            with override_settings(METRICS_DIR=metrics_dir):
+                metrics.observe("http_request_db_queries", labels, 1)
+                body = metrics.render()
+
+            self.assertTrue(Path(metrics_dir, f"{os.getpid()}.json").exists())
+        self.assertIn(
+            'http_request_db_queries_count{method="GET",view="recipe:tag-list"} 3',
+            body,
+        )
+        self.assertIn(
+            'http_request_db_queries_sum{method="GET",view="recipe:tag-list"} 3',
+            body,
+        )
+
+
+class AsgiTests(TestCase):
+    def setUp(self) -> None:
+        user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        token = Token.objects.create(user=user)
+        self.authorization = f"Token {token.key}"
+        cache.clear()
+
+    def test_middleware_runs_natively_in_async_chains(self):
+        async def get_response(request):
+            pass
+
+        for middleware in (
+            PerformanceMiddleware,
+            QueryBudgetMiddleware,
+            ReplicaMiddleware,
+        ):
+            self.assertTrue(asyncio.iscoroutinefunction(middleware(get_response)))
+            self.assertFalse(asyncio.iscoroutinefunction(middleware(lambda r: None)))
+
+    def test_view_hooks_run_on_the_event_loop_in_async_chains(self):
+        async def get_response(request):
+            pass
+
+        for middleware in (PerformanceMiddleware, QueryBudgetMiddleware):
+            hook = middleware(get_response).process_view
+            self.assertTrue(asyncio.iscoroutinefunction(hook))
+            self.assertIsInstance(hook.__self__, middleware)
+
+    async def test_times_queries_of_requests_served_over_asgi(self):
+        # Extra arguments of the async client are sent as headers
+        res = await self.async_client.get(TAGS_URL, AUTHORIZATION=self.authorization)
+
+        self.assertEqual(res.status_code, 200)
+        timing = server_timing(res)
+        self.assertEqual(set(timing), {"db", "view", "serialize", "render", "total"})
+        self.assertNotEqual(timing["db"]["desc"], '"0"')
+
+
+class TimedTests(TestCase):
+    def test_does_nothing_outside_requests(self):
+        with timed("serialize"):
+            pass
+
+    def test_counts_nested_measurements_once(self):
+        timings = RequestTimings()
+        with timings.measure("serialize"):
+            with timings.measure("serialize"):
+                pass
+
+        self.assertEqual(list(timings.durations), ["serialize"])
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Ingredient, Tag
+from core.queries import QueryBudgetExceeded
+from recipe.serializers import RecipeSerializer
+from recipe.views import TagView
+
+TAGS_URL = reverse("recipe:tag-list")
+RECIPES_BULK_URL = reverse("recipe:recipe-bulk")
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "pass")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        cache.clear()
+
+    @patch.object(TagView, "query_budgets", {"list": 0})
+    def test_going_over_budget_fails_when_strict(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "TagView.list ran 1"):
+            self.client.get(TAGS_URL)
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    @patch.object(TagView, "query_budgets", {"list": 0})
+    def test_going_over_budget_is_logged_otherwise(self):
+        with self.assertLogs("core.queries", "WARNING") as logs:
+            res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("over its budget of 0", logs.output[0])
+
+    @patch.object(RecipeSerializer, "prefetch_lookups", return_value=())
+    def test_catches_n_plus_one_queries_in_serializers(self, _lookups):
+        tag = Tag.objects.create(user=self.user, name="tag")
+        ingredient = Ingredient.objects.create(user=self.user, name="ingredient")
+        recipe = {
+            "title": "recipe",
+            "time_minutes": 5,
+            "price": "1.00",
+            "tags": [tag.id],
+            "ingredients": [ingredient.id],
+        }
+
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.post(RECIPES_BULK_URL, [recipe] * 10, format="json")
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_logs_slow_queries_with_their_view_serializer_and_stack(self):
+        with self.assertLogs("core.queries", "WARNING") as logs:
+            self.client.post(TAGS_URL, {"name": "vegan"})
+
+        insert = next(line for line in logs.output if "INSERT" in line)
+        self.assertIn("in TagView.create, serializer TagSerializer", insert)
+        self.assertIn("recipe/views.py", insert)
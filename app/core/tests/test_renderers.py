@@ -0,0 +1,40 @@
+import io
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_renders_like_the_stdlib_renderer(self):
+        data = {"id": 1, "title": "some recipe", "tags": [1, 2], "link": ""}
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(ORJSONRenderer().render(data))),
+            ORJSONParser().parse(io.BytesIO(JSONRenderer().render(data))),
+        )
+
+    def test_keeps_decimals_exact(self):
+        rendered = ORJSONRenderer().render({"price": Decimal("5.10")})
+        self.assertEqual(rendered, b'{"price":"5.10"}')
+
+    def test_renders_lazy_translations(self):
+        rendered = ORJSONRenderer().render({"error": gettext_lazy("Not found.")})
+        self.assertEqual(rendered, b'{"error":"Not found."}')
+
+    def test_indents_when_asked_to(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        self.assertIn(b"\n", rendered)
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_parses_json(self):
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(b'{"a": [1]}')), {"a": [1]})
+
+    def test_rejects_malformed_json(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b"{not json"))
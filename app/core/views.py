@@ -0,0 +1,68 @@
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.permissions import SAFE_METHODS
+
+from core import metrics as request_metrics
+from core.db_routers import (
+    get_sticky_cache,
+    read_replica,
+    stick_to_primary,
+    user_sticky_key,
+)
+from core.health import check_database
+
+
+class StickyReadsMixin:
+    """Keeps users reading from the primary for a while after they write.
+
+    ReplicaMiddleware runs before authentication and only knows the client,
+    this also covers the other clients and tokens of the same user.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        user = request.user
+        if read_replica.get() and user.is_authenticated:
+            if get_sticky_cache().get(user_sticky_key(user.pk)):
+                read_replica.set(None)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            stick_to_primary(user_sticky_key(request.user.pk))
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def live(request):
+    return JsonResponse({"status": "ok"})
+
+
+def ready(request):
+    start = time.perf_counter()
+    try:
+        check_database()
+    except DatabaseError:
+        return JsonResponse({"status": "unavailable"}, status=503)
+
+    db_ms = round((time.perf_counter() - start) * 1000, 2)
+    return JsonResponse({"status": "ok", "db_ms": db_ms})
+
+
+def metrics(request):
+    # Per view timings are for the scraper only, which identifies with a token
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    if not constant_time_compare(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+
+    return HttpResponse(
+        request_metrics.render(), content_type="text/plain; version=0.0.4"
+    )
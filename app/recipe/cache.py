@@ -0,0 +1,36 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+
+def list_version_key(model, user_id):
+    return f"list-version:{model._meta.label_lower}:{user_id}"
+
+
+def get_list_version(model, user_id):
+    return cache.get_or_set(list_version_key(model, user_id), time.time_ns)
+
+
+def invalidate_list(model, user_id):
+    cache.delete(list_version_key(model, user_id))
+
+
+def list_cache_key(model, request):
+    version = get_list_version(model, request.user.pk)
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"list:{model._meta.label_lower}:{request.user.pk}:{version}:{url}"
+
+
+def data_etag(data):
+    content = json.dumps(data, sort_keys=True, default=str).encode()
+    return quote_etag(hashlib.md5(content).hexdigest())
+
+
+def validators_etag(request, validators):
+    content = (
+        f"{request.user.pk}:{request.get_full_path()}:{sorted(validators.items())}"
+    )
+    return quote_etag(hashlib.md5(content.encode()).hexdigest())
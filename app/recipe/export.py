@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from django.db import connections
+from django.db.models import prefetch_related_objects
+
+from core.renderers import dumps
+
+
+def iter_chunks(queryset, chunk_size):
+    # Keyset pages rather than one server-side cursor, which transaction pooling
+    # disables, so memory stays bounded by the chunk either way
+    last_id = None
+    while True:
+        page = queryset.order_by("id")
+        if last_id is not None:
+            page = page.filter(id__gt=last_id)
+        chunk = list(page[:chunk_size])
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1].id
+
+
+def iter_serialized(queryset, serializer_class, chunk_size):
+    for chunk in iter_chunks(queryset, chunk_size):
+        prefetch_related_objects(chunk, *serializer_class.prefetch_lookups())
+        yield from serializer_class(chunk, many=True).data
+
+
+def iter_in_thread(iterable):
+    """Advances iterable in a worker thread of its own, with the caller's context.
+
+    Under ASGI, Django 4.0 consumes streaming responses on the event loop, where
+    the ORM refuses to run. The loop still waits for each step.
+    """
+    context = copy_context()
+    return _iter_in_thread(context, iter(iterable))
+
+
+def _iter_in_thread(context, iterator):
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        while (
+            item := executor.submit(context.run, next, iterator, None).result()
+        ) is not None:
+            yield item
+    finally:
+        executor.submit(connections.close_all).result()
+        executor.shutdown()
+
+
+def stream_json_lines(items):
+    for item in items:
+        yield dumps(item) + b"\n"
+
+
+def stream_json_array(items):
+    separator = b"["
+    for item in items:
+        yield separator + dumps(item)
+        separator = b","
+    yield b"]" if separator == b"," else b"[]"
@@ -0,0 +1,48 @@
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        pks, errors = [], []
+        for item in data:
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pks.append(int(item))
+            except (TypeError, ValueError):
+                errors.append(self.child_relation.error("incorrect_type", item))
+
+        found = self.child_relation.get_queryset().in_bulk(set(pks))
+        errors.extend(
+            self.child_relation.error("does_not_exist", pk)
+            for pk in pks
+            if pk not in found
+        )
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return [found[pk] for pk in pks]
+
+
+class UserPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(user=self.context["request"].user)
+
+    def error(self, key, value):
+        if key == "incorrect_type":
+            return self.error_messages[key].format(data_type=type(value).__name__)
+        return self.error_messages[key].format(pk_value=value)
@@ -0,0 +1,81 @@
+from django.db.models import Exists, OuterRef
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import Recipe
+from core.search import search_recipes
+
+RELATIONS = {
+    "tags": (Recipe.tags.through, "tag_id"),
+    "ingredients": (Recipe.ingredients.through, "ingredient_id"),
+}
+
+
+def filter_recipes(queryset, match_all=False, ranges=None, **related_ids):
+    for relation, ids in related_ids.items():
+        if not ids:
+            continue
+
+        through, column = RELATIONS[relation]
+        links = through.objects.filter(recipe_id=OuterRef("pk"))
+        if match_all:
+            for pk in set(ids):
+                queryset = queryset.filter(Exists(links.filter(**{column: pk})))
+        else:
+            queryset = queryset.filter(Exists(links.filter(**{f"{column}__in": ids})))
+
+    for lookup, value in (ranges or {}).items():
+        queryset = queryset.filter(**{lookup: value})
+
+    return queryset
+
+
+class RecipeFilterBackend(BaseFilterBackend):
+    match_field = serializers.ChoiceField(choices=("any", "all"))
+    id_field = serializers.IntegerField()
+    range_fields = {
+        "price": serializers.DecimalField(max_digits=5, decimal_places=2),
+        "time_minutes": serializers.IntegerField(),
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        match = self.validate(params, "match", self.match_field) or "any"
+        related_ids = {
+            relation: self.validate_ids(params, relation) for relation in RELATIONS
+        }
+        ranges = {}
+        for field, field_type in self.range_fields.items():
+            for bound, lookup in (("min", "gte"), ("max", "lte")):
+                value = self.validate(params, f"{field}_{bound}", field_type)
+                if value is not None:
+                    ranges[f"{field}__{lookup}"] = value
+
+        queryset = filter_recipes(
+            queryset, match_all=match == "all", ranges=ranges, **related_ids
+        )
+
+        search = params.get("q", "").strip()
+        if search:
+            queryset = search_recipes(queryset, search)
+
+        return queryset
+
+    def validate(self, params, name, field):
+        if name not in params:
+            return None
+
+        try:
+            return field.run_validation(params[name])
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({name: exc.detail})
+
+    def validate_ids(self, params, name):
+        if not params.get(name):
+            return []
+
+        try:
+            return [self.id_field.run_validation(pk) for pk in params[name].split(",")]
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({name: exc.detail})
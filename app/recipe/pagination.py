@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserListCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class NameCursorPagination(UserListCursorPagination):
+    ordering = ("-name", "-id")
+
+
+class TitleCursorPagination(UserListCursorPagination):
+    ordering = ("-title", "-id")
+
+
+class RecipeCursorPagination(TitleCursorPagination):
+    def get_ordering(self, request, queryset, view):
+        if "rank" in queryset.query.annotations:
+            return ("-rank", "-id")
+
+        return super().get_ordering(request, queryset, view)
@@ -1,35 +1,277 @@
+from collections import defaultdict
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import connection, transaction
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.utils import timezone
 from rest_framework import serializers
 
 from core import models
-from core.models import Ingredient, Tag
+from core.models import Ingredient, Recipe, Tag
+from core.search import refresh_search
+from core.serializers import TimedSerializerMixin
+from core.signals import deferred_recipe_changes
+from recipe.fields import UserPrimaryKeyRelatedField
+
+
+class ValuesListMixin:
+    """Read-only list output built straight from .values() rows.
+
+    Renders the same data as the serializer would for model instances,
+    without building them or binding fields per row.
+    """
+
+    many_related_fields = ()
+
+    @classmethod
+    def list_values(cls, queryset):
+        queryset = queryset.prefetch_related(None)
+        if connection.vendor == "postgresql":
+            queryset = queryset.annotate(
+                **{
+                    f"{name}_ids": cls.related_ids(name)
+                    for name in cls.many_related_fields
+                }
+            )
+        fields = [f for f in cls.Meta.fields if f not in cls.many_related_fields]
+        return queryset.values(*fields, *queryset.query.annotations)
+
+    @classmethod
+    def related_ids(cls, name):
+        field = cls.Meta.model._meta.get_field(name)
+        source, target = field.m2m_column_name(), field.m2m_reverse_name()
+        return Subquery(
+            field.remote_field.through.objects.filter(**{source: OuterRef("pk")})
+            .values(source)
+            .annotate(ids=ArrayAgg(target, ordering=target))
+            .values("ids")
+        )
+
+    @classmethod
+    def fetch_related_ids(cls, rows):
+        pks = [row["id"] for row in rows]
+        for name in cls.many_related_fields:
+            field = cls.Meta.model._meta.get_field(name)
+            source, target = field.m2m_column_name(), field.m2m_reverse_name()
+            links = field.remote_field.through.objects.filter(**{f"{source}__in": pks})
+            related = defaultdict(list)
+            for pk, related_pk in links.order_by(target).values_list(source, target):
+                related[pk].append(related_pk)
+            for row in rows:
+                row[f"{name}_ids"] = related[row["id"]]
+
+    @classmethod
+    def represent_values(cls, rows):
+        rows = list(rows)
+        if cls.many_related_fields and connection.vendor != "postgresql":
+            cls.fetch_related_ids(rows)
+
+        converters = [
+            (name, *cls.value_converter(name, field))
+            for name, field in cls().fields.items()
+        ]
+        return [
+            {name: convert(row[key]) for name, key, convert in converters}
+            for row in rows
+        ]
+
+    @classmethod
+    def value_converter(cls, name, field):
+        if name in cls.many_related_fields:
+            return f"{name}_ids", lambda ids: ids or []
 
+        def convert(value):
+            return None if value is None else field.to_representation(value)
 
-class TagSerializer(serializers.ModelSerializer):
+        return name, convert
+
+
+class TagSerializer(ValuesListMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Tag
         fields = ("id", "name")
         read_only_fields = ("id",)
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(ValuesListMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Ingredient
         fields = ("id", "name")
         read_only_fields = ("id",)
 
 
-class RecipeSerializer(serializers.ModelSerializer):
-    ingredients = serializers.PrimaryKeyRelatedField(
+class RecipeSerializer(
+    TimedSerializerMixin, ValuesListMixin, serializers.ModelSerializer
+):
+    ingredients = UserPrimaryKeyRelatedField(
         many=True, queryset=Ingredient.objects.all()
     )
-    tags = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all())
+    tags = UserPrimaryKeyRelatedField(many=True, queryset=Tag.objects.all())
+
+    many_related_fields = ("ingredients", "tags")
 
     class Meta:
         model = models.Recipe
         fields = ("id", "title", "ingredients", "tags", "link", "price", "time_minutes")
         read_only_fields = ("id",)
 
+    @classmethod
+    def prefetch_lookups(cls):
+        return (
+            Prefetch(
+                "ingredients", queryset=Ingredient.objects.only("id").order_by("id")
+            ),
+            Prefetch("tags", queryset=Tag.objects.only("id").order_by("id")),
+        )
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.prefetch_related(*cls.prefetch_lookups())
+
+    def create(self, validated_data):
+        with deferred_recipe_changes():
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with deferred_recipe_changes():
+            return super().update(instance, validated_data)
+
 
 class RecipeDetailSerializer(RecipeSerializer):
     ingredients = IngredientSerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
+
+    @classmethod
+    def prefetch_lookups(cls):
+        return (
+            Prefetch("ingredients", queryset=Ingredient.objects.only("id", "name")),
+            Prefetch("tags", queryset=Tag.objects.only("id", "name")),
+        )
+
+
+class BulkRecipeListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        # Oversized lists fail in ListSerializer, before any related lookup
+        if isinstance(data, list) and not (
+            self.max_length is not None and len(data) > self.max_length
+        ):
+            self.child.resolve_related(data)
+
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        ids = [item["id"] for item in attrs if "id" in item]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each recipe can only be updated once.")
+        return attrs
+
+    @transaction.atomic
+    def create(self, validated_data):
+        relations = [
+            (attrs.pop("ingredients"), attrs.pop("tags")) for attrs in validated_data
+        ]
+        recipes = Recipe.objects.bulk_create(
+            Recipe(**attrs) for attrs in validated_data
+        )
+        self.add_relations(recipes, relations)
+        refresh_search([recipe.id for recipe in recipes])
+
+        return recipes
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        now = timezone.now()
+        recipes, relations = [], []
+        for attrs in validated_data:
+            recipe = self.child.existing_recipes[attrs.pop("id")]
+            relations.append((attrs.pop("ingredients"), attrs.pop("tags")))
+            for field, value in attrs.items():
+                setattr(recipe, field, value)
+            recipe.updated_at = now
+            recipes.append(recipe)
+
+        fields = {field for attrs in validated_data for field in attrs}
+        Recipe.objects.bulk_update(recipes, [*fields, "updated_at"], batch_size=1000)
+        ids = [recipe.id for recipe in recipes]
+        Recipe.ingredients.through.objects.filter(recipe_id__in=ids).delete()
+        Recipe.tags.through.objects.filter(recipe_id__in=ids).delete()
+        self.add_relations(recipes, relations)
+        refresh_search(ids)
+
+        return recipes
+
+    def add_relations(self, recipes, relations):
+        Recipe.ingredients.through.objects.bulk_create(
+            Recipe.ingredients.through(recipe_id=recipe.id, ingredient_id=pk)
+            for recipe, (ingredients, _tags) in zip(recipes, relations)
+            for pk in set(ingredients)
+        )
+        Recipe.tags.through.objects.bulk_create(
+            Recipe.tags.through(recipe_id=recipe.id, tag_id=pk)
+            for recipe, (_ingredients, tags) in zip(recipes, relations)
+            for pk in set(tags)
+        )
+
+
+class BulkRecipeSerializer(RecipeSerializer):
+    ingredients = serializers.ListField(child=serializers.IntegerField())
+    tags = serializers.ListField(child=serializers.IntegerField())
+
+    related_models = {"ingredients": Ingredient, "tags": Tag}
+
+    class Meta(RecipeSerializer.Meta):
+        list_serializer_class = BulkRecipeListSerializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Bulk updates, given the recipes they may change, name them by id
+        if self.updating():
+            fields["id"] = serializers.IntegerField()
+        return fields
+
+    def updating(self):
+        return self.parent is not None and self.parent.instance is not None
+
+    def resolve_related(self, items):
+        user = self.context["request"].user
+        self.existing_related = {}
+        for field, model in self.related_models.items():
+            self.existing_related[field] = set(
+                model.objects.filter(
+                    user=user, id__in=self.requested_ids(items, field)
+                ).values_list("id", flat=True)
+            )
+
+        if self.updating():
+            self.existing_recipes = self.parent.instance.in_bulk(
+                self.requested_ids(items, "id")
+            )
+
+    @staticmethod
+    def requested_ids(items, field):
+        requested = set()
+        for item in items:
+            pks = item.get(field) if isinstance(item, dict) else None
+            for pk in pks if isinstance(pks, list) else [pks]:
+                try:
+                    requested.add(int(pk))
+                except (TypeError, ValueError):
+                    pass
+        return requested
+
+    def validate(self, attrs):
+        errors = {}
+        if self.updating() and attrs["id"] not in self.existing_recipes:
+            errors["id"] = [f"Recipe {attrs['id']} does not exist."]
+        for field, existing in self.existing_related.items():
+            missing = [pk for pk in attrs[field] if pk not in existing]
+            if missing:
+                message = serializers.PrimaryKeyRelatedField.default_error_messages[
+                    "does_not_exist"
+                ]
+                errors[field] = [message.format(pk_value=pk) for pk in missing]
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return attrs
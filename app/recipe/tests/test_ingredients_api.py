@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
@@ -23,6 +24,7 @@ class PrivateIngredientsApi(TestCase):
         self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
         self.client = APIClient()
         self.client.force_authenticate(user=self.user)
+        cache.clear()
 
     def test_can_create_and_get_ingredients_through_the_api(self):
         payload = {"name": "sugar"}
@@ -31,8 +33,8 @@ class PrivateIngredientsApi(TestCase):
 
         self.assertTrue(Ingredient.objects.filter(name=payload["name"]).exists())
         get_res = self.client.get(INGREDIENTS_URL)
-        self.assertEqual(len(get_res.data), 1)
-        self.assertEqual(get_res.data[0]["name"], payload["name"])
+        self.assertEqual(len(get_res.data["results"]), 1)
+        self.assertEqual(get_res.data["results"][0]["name"], payload["name"])
 
     def only_returns_ingredients_created_by_the_requesting_user(self):
         other_user = get_user_model().objects.create_user(
@@ -42,5 +44,5 @@ class PrivateIngredientsApi(TestCase):
         Ingredient.objects.create("not found", user=other_user)
 
         res = self.client.get(INGREDIENTS_URL)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]["name"], ingredient.name)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]["name"], ingredient.name)
@@ -1,12 +1,30 @@
+import json
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.http import http_date
 from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
 from core.models import Ingredient, Recipe, Tag
+from recipe.serializers import (
+    BulkRecipeSerializer,
+    RecipeDetailSerializer,
+    RecipeSerializer,
+)
+from recipe.views import RecipeView
 
 RECIPES_URL = reverse("recipe:recipe-list")
+RECIPES_BULK_URL = reverse("recipe:recipe-bulk")
+RECIPES_EXPORT_URL = reverse("recipe:recipe-export")
 
 
 def recipe_detail_url(recipe_id):
@@ -51,8 +69,8 @@ class PrivateRecipesApi(TestCase):
 
         self.assertTrue(Recipe.objects.filter(title=payload["title"]).exists())
         get_res = self.client.get(RECIPES_URL)
-        self.assertEqual(len(get_res.data), 1)
-        self.assertEqual(get_res.data[0]["title"], payload["title"])
+        self.assertEqual(len(get_res.data["results"]), 1)
+        self.assertEqual(get_res.data["results"][0]["title"], payload["title"])
 
     def test_only_returns_recipes_created_by_the_requesting_user(self):
         other_user = get_user_model().objects.create_user(
@@ -62,8 +80,8 @@ class PrivateRecipesApi(TestCase):
         Recipe.objects.create(user=other_user, **get_sample_recipe())
 
         res = self.client.get(RECIPES_URL)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]["title"], recipe.title)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]["title"], recipe.title)
 
     def test_returns_a_recipe_details(self):
         recipe = get_sample_recipe()
@@ -126,3 +144,558 @@ class PrivateRecipesApi(TestCase):
         res = self.client.put(recipe_detail_url(created_recipe_id), recipe_without_tag)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data["tags"]), 0)
+
+    def test_rejects_tags_and_ingredients_of_other_users(self):
+        other_user = get_user_model().objects.create_user(
+            "another@user.com", "irrelevant"
+        )
+        recipe = get_sample_recipe(
+            tags=[save_sample_tag(other_user).id],
+            ingredients=[save_sample_ingredient(other_user).id],
+        )
+
+        res = self.client.post(RECIPES_URL, recipe)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("tags", res.data)
+        self.assertIn("ingredients", res.data)
+
+    def test_reports_all_missing_ids_together(self):
+        recipe = get_sample_recipe(tags=[self.tag.id, 998, 999])
+
+        res = self.client.post(RECIPES_URL, recipe)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data["tags"]), 2)
+
+
+class RecipesApiQueryCount(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def save_sample_recipes(self, count):
+        for i in range(count):
+            recipe = Recipe.objects.create(user=self.user, **get_sample_recipe())
+            recipe.tags.add(save_sample_tag(self.user, name=f"tag {i}"))
+            recipe.ingredients.add(save_sample_ingredient(self.user, name=f"ing {i}"))
+        return recipe
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_list_query_count_does_not_grow_with_recipes(self):
+        self.save_sample_recipes(1)
+        queries_for_one = self.count_queries(RECIPES_URL)
+
+        self.save_sample_recipes(10)
+        queries_for_many = self.count_queries(RECIPES_URL)
+
+        self.assertEqual(queries_for_one, queries_for_many)
+
+    def test_create_query_count_does_not_grow_with_relations(self):
+        tags = [save_sample_tag(self.user, name=f"tag {i}").id for i in range(10)]
+        ingredients = [
+            save_sample_ingredient(self.user, name=f"ing {i}").id for i in range(10)
+        ]
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(
+                RECIPES_URL,
+                get_sample_recipe(tags=tags[:1], ingredients=ingredients[:1]),
+            )
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(
+                RECIPES_URL, get_sample_recipe(tags=tags, ingredients=ingredients)
+            )
+
+        self.assertEqual(len(few), len(many))
+
+    def test_detail_query_count_does_not_grow_with_relations(self):
+        recipe = self.save_sample_recipes(1)
+        queries_for_one = self.count_queries(recipe_detail_url(recipe.id))
+
+        for i in range(10):
+            recipe.tags.add(save_sample_tag(self.user, name=f"extra tag {i}"))
+            recipe.ingredients.add(save_sample_ingredient(self.user, name=f"extra {i}"))
+        queries_for_many = self.count_queries(recipe_detail_url(recipe.id))
+
+        self.assertEqual(queries_for_one, queries_for_many)
+
+    def assert_within_budget(self, action, method, url, payload):
+        with CaptureQueriesContext(connection) as queries:
+            res = getattr(self.client, method)(url, payload)
+        self.assertLess(res.status_code, 300)
+        # Postgres also rebuilds search_vector once per save, which SQLite skips
+        self.assertLessEqual(len(queries) + 1, RecipeView.query_budgets[action])
+
+    def changed_relations(self):
+        return {
+            "tags": [save_sample_tag(self.user, name="new tag").id],
+            "ingredients": [save_sample_ingredient(self.user, name="new ing").id],
+        }
+
+    def test_create_stays_within_budget(self):
+        payload = get_sample_recipe(**self.changed_relations())
+        self.assert_within_budget("create", "post", RECIPES_URL, payload)
+
+    def test_update_changing_both_relations_stays_within_budget(self):
+        recipe = self.save_sample_recipes(1)
+        payload = get_sample_recipe(title="new", **self.changed_relations())
+        url = recipe_detail_url(recipe.id)
+        self.assert_within_budget("update", "put", url, payload)
+
+    def test_partial_update_changing_both_relations_stays_within_budget(self):
+        recipe = self.save_sample_recipes(1)
+        payload = {"title": "new", **self.changed_relations()}
+        url = recipe_detail_url(recipe.id)
+        self.assert_within_budget("partial_update", "patch", url, payload)
+
+
+class RecipeListParity(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        tags = [save_sample_tag(self.user, name=f"tag {i}") for i in range(3)]
+        ingredients = [
+            save_sample_ingredient(self.user, name=f"ing {i}") for i in range(3)
+        ]
+        Recipe.objects.create(user=self.user, **get_sample_recipe(title="bare"))
+        for i in range(3):
+            recipe = Recipe.objects.create(
+                user=self.user,
+                **get_sample_recipe(
+                    title=f"recipe {i}", price=Decimal(f"{i}.5"), link=f"https://{i}"
+                ),
+            )
+            recipe.tags.add(*tags[i:])
+            recipe.ingredients.add(*reversed(ingredients[: i + 1]))
+
+    def test_list_matches_the_recipe_serializer(self):
+        recipes = RecipeSerializer.setup_eager_loading(
+            Recipe.objects.filter(user=self.user).order_by("-title", "-id")
+        )
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json()["results"],
+            json.loads(
+                JSONRenderer().render(RecipeSerializer(recipes, many=True).data)
+            ),
+        )
+
+    def test_search_results_match_the_recipe_serializer(self):
+        res = self.client.get(RECIPES_URL, {"q": "recipe"})
+
+        titles = [recipe["title"] for recipe in res.data["results"]]
+        self.assertEqual(len(titles), 3)
+        recipes = Recipe.objects.filter(title__in=titles)
+        expected = {
+            recipe["id"]: recipe
+            for recipe in RecipeSerializer(
+                RecipeSerializer.setup_eager_loading(recipes), many=True
+            ).data
+        }
+        self.assertEqual(
+            res.data["results"], [expected[item["id"]] for item in res.data["results"]]
+        )
+
+
+class RecipeExportApi(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.tag = save_sample_tag(self.user)
+        self.ingredient = save_sample_ingredient(self.user)
+        for i in range(5):
+            recipe = Recipe.objects.create(
+                user=self.user, **get_sample_recipe(title=f"recipe {i}")
+            )
+            recipe.tags.add(self.tag)
+            recipe.ingredients.add(self.ingredient)
+        Recipe.objects.create(
+            user=get_user_model().objects.create_user("other@test.com", "irrelevant"),
+            **get_sample_recipe(),
+        )
+
+    def expected_recipes(self):
+        recipes = Recipe.objects.filter(user=self.user).order_by("id")
+        return json.loads(
+            JSONRenderer().render(RecipeDetailSerializer(recipes, many=True).data)
+        )
+
+    def export(self, **params):
+        res = self.client.get(RECIPES_EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        return res, b"".join(res.streaming_content)
+
+    def test_exports_the_users_recipes_as_a_json_array(self):
+        res, content = self.export()
+
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(json.loads(content), self.expected_recipes())
+
+    def test_exports_the_users_recipes_as_json_lines(self):
+        res, content = self.export(layout="jsonl")
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            self.expected_recipes(),
+        )
+
+    def test_exports_an_empty_array_without_recipes(self):
+        Recipe.objects.filter(user=self.user).delete()
+
+        _res, content = self.export()
+
+        self.assertEqual(json.loads(content), [])
+
+    @patch.object(RecipeView, "export_chunk_size", 2)
+    def test_prefetches_relations_per_chunk(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.export()
+
+        # recipes, tags and ingredients for each of 3 chunks, the last one short
+        self.assertEqual(len(queries), 3 * 3)
+
+    def test_rejects_unknown_layouts(self):
+        res = self.client.get(RECIPES_EXPORT_URL, {"layout": "xml"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("layout", res.data)
+
+
+class RecipeExportAsgi(TransactionTestCase):
+    # Exports run their queries in a thread of their own, which only sees
+    # committed rows
+    def setUp(self) -> None:
+        user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.authorization = f"Token {Token.objects.create(user=user).key}"
+        for i in range(3):
+            Recipe.objects.create(user=user, **get_sample_recipe(title=f"recipe {i}"))
+
+    @patch.object(RecipeView, "export_chunk_size", 2)
+    async def test_exports_when_served_over_asgi(self):
+        res = await self.async_client.get(
+            RECIPES_EXPORT_URL, AUTHORIZATION=self.authorization
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = b"".join(res.streaming_content)
+        self.assertEqual(
+            [recipe["title"] for recipe in json.loads(content)],
+            ["recipe 0", "recipe 1", "recipe 2"],
+        )
+
+
+class BulkRecipesApi(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.tag = save_sample_tag(self.user)
+        self.ingredient = save_sample_ingredient(self.user)
+
+    def bulk_payload(self, count, **params):
+        return [
+            get_sample_recipe(
+                title=f"recipe {i}",
+                tags=[self.tag.id],
+                ingredients=[self.ingredient.id],
+                **params,
+            )
+            for i in range(count)
+        ]
+
+    def test_creates_all_recipes_with_their_relations(self):
+        res = self.client.post(RECIPES_BULK_URL, self.bulk_payload(3), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [r["title"] for r in res.data], [f"recipe {i}" for i in range(3)]
+        )
+        for recipe in Recipe.objects.filter(user=self.user):
+            self.assertEqual(list(recipe.tags.all()), [self.tag])
+            self.assertEqual(list(recipe.ingredients.all()), [self.ingredient])
+
+    def test_query_count_does_not_grow_with_the_number_of_recipes(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(RECIPES_BULK_URL, self.bulk_payload(2), format="json")
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(RECIPES_BULK_URL, self.bulk_payload(20), format="json")
+
+        self.assertEqual(len(few), len(many))
+
+    def test_reports_errors_per_item_and_creates_nothing(self):
+        other_user = get_user_model().objects.create_user(
+            "other@user.com", "irrelevant"
+        )
+        other_tag = save_sample_tag(other_user)
+        payload = self.bulk_payload(2)
+        payload[1]["tags"] = [other_tag.id]
+        del payload[0]["title"]
+
+        res = self.client.post(RECIPES_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", res.data[0])
+        self.assertIn("tags", res.data[1])
+        self.assertFalse(Recipe.objects.exists())
+
+    @patch.object(RecipeView, "bulk_max_recipes", 2)
+    @patch.object(BulkRecipeSerializer, "resolve_related")
+    def test_rejects_too_many_recipes_before_looking_up_relations(self, resolve):
+        res = self.client.post(RECIPES_BULK_URL, self.bulk_payload(3), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        resolve.assert_not_called()
+
+    def save_recipes(self, count):
+        self.client.post(RECIPES_BULK_URL, self.bulk_payload(count), format="json")
+        return list(Recipe.objects.filter(user=self.user).order_by("id"))
+
+    def update_payload(self, recipes, **params):
+        return [
+            {**payload, "id": recipe.id}
+            for recipe, payload in zip(
+                recipes, self.bulk_payload(len(recipes), **params)
+            )
+        ]
+
+    def test_updates_recipes_and_replaces_their_relations(self):
+        recipes = self.save_recipes(2)
+        new_tag = save_sample_tag(self.user, name="new tag")
+        payload = self.update_payload(recipes, time_minutes=42)
+        payload[1].update(title="renamed", tags=[new_tag.id], ingredients=[])
+
+        res = self.client.put(RECIPES_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["title"] for r in res.data], ["recipe 0", "renamed"])
+        recipes = Recipe.objects.filter(user=self.user).order_by("id")
+        self.assertEqual([recipe.time_minutes for recipe in recipes], [42, 42])
+        self.assertEqual(list(recipes[0].tags.all()), [self.tag])
+        self.assertEqual(list(recipes[1].tags.all()), [new_tag])
+        self.assertFalse(recipes[1].ingredients.exists())
+        self.assertEqual(recipes[1].search_text, "new tag")
+
+    def test_update_query_count_does_not_grow_with_the_number_of_recipes(self):
+        recipes = self.save_recipes(20)
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.put(
+                RECIPES_BULK_URL, self.update_payload(recipes[:2]), format="json"
+            )
+        with CaptureQueriesContext(connection) as many:
+            self.client.put(
+                RECIPES_BULK_URL, self.update_payload(recipes), format="json"
+            )
+
+        self.assertEqual(len(few), len(many))
+
+    def test_update_reports_unknown_recipes_and_changes_nothing(self):
+        recipes = self.save_recipes(2)
+        other_recipe = Recipe.objects.create(
+            user=get_user_model().objects.create_user("other@user.com", "irrelevant"),
+            **get_sample_recipe(),
+        )
+        payload = self.update_payload([recipes[0], other_recipe], time_minutes=42)
+
+        res = self.client.put(RECIPES_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("id", res.data[1])
+        self.assertFalse(Recipe.objects.filter(time_minutes=42).exists())
+
+    def test_update_rejects_the_same_recipe_twice(self):
+        recipes = self.save_recipes(1)
+        payload = self.update_payload(recipes * 2)
+
+        res = self.client.put(RECIPES_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalRecipesApi(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.tag = save_sample_tag(self.user)
+        self.recipe = Recipe.objects.create(user=self.user, **get_sample_recipe())
+        self.recipe.tags.add(self.tag)
+
+    def test_list_and_detail_send_validators(self):
+        res = self.client.get(RECIPES_URL)
+        self.assertIn("ETag", res)
+        self.assertNotIn("Last-Modified", res)
+
+        res = self.client.get(recipe_detail_url(self.recipe.id))
+        self.assertIn("ETag", res)
+        self.assertIn("Last-Modified", res)
+
+    def test_deleting_the_latest_recipe_changes_the_list(self):
+        latest = Recipe.objects.create(user=self.user, **get_sample_recipe())
+        seen_at = http_date(time.time())
+
+        latest.delete()
+        res = self.client.get(RECIPES_URL, HTTP_IF_MODIFIED_SINCE=seen_at)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_matching_etag_returns_not_modified_after_one_query(self):
+        for url in (RECIPES_URL, recipe_detail_url(self.recipe.id)):
+            etag = self.client.get(url)["ETag"]
+
+            with self.assertNumQueries(1):
+                res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_updating_a_recipe_changes_its_etag(self):
+        url = recipe_detail_url(self.recipe.id)
+        etag = self.client.get(url)["ETag"]
+
+        self.client.patch(url, {"title": "new title"})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["title"], "new title")
+
+    def test_renaming_a_tag_changes_the_detail_etag(self):
+        url = recipe_detail_url(self.recipe.id)
+        etag = self.client.get(url)["ETag"]
+
+        self.tag.name = "renamed"
+        self.tag.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_deleting_a_tag_changes_the_list_etag(self):
+        etag = self.client.get(RECIPES_URL)["ETag"]
+
+        self.tag.delete()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["tags"], [])
+
+
+class RecipeFiltersApi(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.vegan = save_sample_tag(self.user, name="vegan")
+        self.quick = save_sample_tag(self.user, name="quick")
+        self.tofu = save_sample_ingredient(self.user, name="tofu")
+
+        self.vegan_quick = Recipe.objects.create(
+            user=self.user, **get_sample_recipe(title="a", price=5, time_minutes=5)
+        )
+        self.vegan_quick.tags.add(self.vegan, self.quick)
+        self.vegan_quick.ingredients.add(self.tofu)
+        self.vegan_only = Recipe.objects.create(
+            user=self.user, **get_sample_recipe(title="b", price=15, time_minutes=60)
+        )
+        self.vegan_only.tags.add(self.vegan)
+        self.untagged = Recipe.objects.create(
+            user=self.user, **get_sample_recipe(title="c", price=25, time_minutes=90)
+        )
+
+    def get_titles(self, **params):
+        res = self.client.get(RECIPES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return sorted(recipe["title"] for recipe in res.data["results"])
+
+    def test_filters_by_any_of_the_given_tags_without_duplicates(self):
+        titles = self.get_titles(tags=f"{self.vegan.id},{self.quick.id}")
+        self.assertEqual(titles, ["a", "b"])
+
+    def test_filters_by_all_of_the_given_tags(self):
+        titles = self.get_titles(tags=f"{self.vegan.id},{self.quick.id}", match="all")
+        self.assertEqual(titles, ["a"])
+
+    def test_filters_by_ingredients(self):
+        self.assertEqual(self.get_titles(ingredients=str(self.tofu.id)), ["a"])
+
+    def test_filters_by_price_and_time_ranges(self):
+        self.assertEqual(self.get_titles(price_min="10", price_max="20"), ["b"])
+        self.assertEqual(self.get_titles(time_minutes_min="60"), ["b", "c"])
+
+    def test_rejects_invalid_filters(self):
+        for params in ({"tags": "1,x"}, {"match": "some"}, {"price_max": "cheap"}):
+            res = self.client.get(RECIPES_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(list(params)[0], res.data)
+
+
+class RecipeSearchApi(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user("test@test.com", "irrelevant")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.tag = save_sample_tag(self.user, name="breakfast")
+        self.ingredient = save_sample_ingredient(self.user, name="avocado")
+
+        self.toast = Recipe.objects.create(
+            user=self.user, **get_sample_recipe(title="avocado toast")
+        )
+        self.salad = Recipe.objects.create(
+            user=self.user, **get_sample_recipe(title="green salad")
+        )
+        self.salad.tags.add(self.tag)
+        self.salad.ingredients.add(self.ingredient)
+
+    def search(self, text):
+        res = self.client.get(RECIPES_URL, {"q": text})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [recipe["title"] for recipe in res.data["results"]]
+
+    def test_finds_recipes_by_title_tag_and_ingredient(self):
+        self.assertEqual(self.search("salad"), ["green salad"])
+        self.assertEqual(self.search("breakfast"), ["green salad"])
+        self.assertEqual(self.search("green breakfast"), ["green salad"])
+
+    def test_ranks_title_matches_first(self):
+        self.assertEqual(self.search("avocado"), ["avocado toast", "green salad"])
+
+    def test_follows_tag_renames_and_removals(self):
+        self.tag.name = "brunch"
+        self.tag.save()
+        self.assertEqual(self.search("brunch"), ["green salad"])
+
+        self.salad.tags.remove(self.tag)
+        self.assertEqual(self.search("brunch"), [])
+
+    def test_refreshes_once_when_saving_a_recipe_and_its_relations(self):
+        payload = {
+            "title": "avocado salad",
+            "time_minutes": 5,
+            "price": "1.00",
+            "tags": [self.tag.id],
+            "ingredients": [self.ingredient.id],
+        }
+        with patch("core.signals.refresh_search") as refresh:
+            self.client.put(recipe_detail_url(self.toast.id), payload)
+
+        refresh.assert_called_once_with({self.toast.id})
+
+    def test_finds_recipes_created_in_bulk(self):
+        payload = [get_sample_recipe(title="pie", tags=[self.tag.id], ingredients=[])]
+        self.client.post(RECIPES_BULK_URL, payload, format="json")
+
+        self.assertEqual(self.search("pie breakfast"), ["pie"])
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -24,16 +25,17 @@ class PrivateTagsApiTest(TestCase):
         self.user = get_user_model().objects.create_user("some@email.com", "irrelevant")
         self.client = APIClient()
         self.client.force_authenticate(user=self.user)
+        cache.clear()
 
     def test_get_tags(self):
         Tag.objects.create(user=self.user, name="Vegan")
         Tag.objects.create(user=self.user, name="Vegetarian")
-        all_tags = Tag.objects.all().order_by("-name")
+        all_tags = Tag.objects.all().order_by("-name", "-id")
 
         res = self.client.get(TAGS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, TagSerializer(all_tags, many=True).data)
+        self.assertEqual(res.data["results"], TagSerializer(all_tags, many=True).data)
 
     def test_only_users_tags_are_returned(self):
         another_user = get_user_model().objects.create_user(
@@ -45,8 +47,10 @@ class PrivateTagsApiTest(TestCase):
         res = self.client.get(TAGS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0], {"id": user_tag.id, "name": user_tag.name})
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(
+            res.data["results"][0], {"id": user_tag.id, "name": user_tag.name}
+        )
 
     def test_tags_creation(self):
         payload = {"name": "some tag"}
@@ -55,3 +59,53 @@ class PrivateTagsApiTest(TestCase):
         self.assertTrue(
             Tag.objects.filter(user=self.user, name=payload["name"]).exists()
         )
+
+    def test_tags_are_paginated_with_a_cursor(self):
+        tags = [Tag.objects.create(user=self.user, name="Same") for _ in range(5)]
+
+        seen = []
+        url = f"{TAGS_URL}?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data["results"]), 2)
+            seen.extend(tag["id"] for tag in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(seen, sorted((tag.id for tag in tags), reverse=True))
+
+    def test_unchanged_list_is_served_from_cache(self):
+        Tag.objects.create(user=self.user, name="Vegan")
+        self.client.get(TAGS_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.data["results"][0]["name"], "Vegan")
+
+    @override_settings(CACHE_LISTS=False)
+    def test_lists_are_not_cached_without_a_shared_cache(self):
+        Tag.objects.create(user=self.user, name="Vegan")
+        self.client.get(TAGS_URL)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.data["results"][0]["name"], "Vegan")
+
+    def test_creating_a_tag_invalidates_the_cached_list(self):
+        self.client.get(TAGS_URL)
+        self.client.post(TAGS_URL, {"name": "new tag"})
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_matching_etag_returns_not_modified(self):
+        Tag.objects.create(user=self.user, name="Vegan")
+        etag = self.client.get(TAGS_URL)["ETag"]
+
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
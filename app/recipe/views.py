@@ -1,7 +1,33 @@
-from rest_framework import authentication, mixins, permissions, viewsets
+from contextlib import nullcontext
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.authentication import CachedTokenAuthentication
+from core.db_routers import primary_reads
+from core.middleware import timed
 from core.models import Ingredient, Recipe, Tag
+from core.views import StickyReadsMixin
+from recipe.cache import data_etag, list_cache_key, validators_etag
+from recipe.export import (
+    iter_in_thread,
+    iter_serialized,
+    stream_json_array,
+    stream_json_lines,
+)
+from recipe.filters import RecipeFilterBackend
+from recipe.pagination import NameCursorPagination, RecipeCursorPagination
 from recipe.serializers import (
+    BulkRecipeSerializer,
     IngredientSerializer,
     RecipeDetailSerializer,
     RecipeSerializer,
@@ -9,18 +35,59 @@ from recipe.serializers import (
 )
 
 
+class ValuesListModelMixin(mixins.ListModelMixin):
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        queryset = serializer_class.list_values(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with timed("serialize"):
+                data = serializer_class.represent_values(page)
+            return self.get_paginated_response(data)
+
+        with timed("serialize"):
+            data = serializer_class.represent_values(queryset)
+        return Response(data)
+
+
 class AuthenticatedListCreateView(
-    viewsets.GenericViewSet, mixins.ListModelMixin, mixins.CreateModelMixin
+    StickyReadsMixin,
+    viewsets.GenericViewSet,
+    ValuesListModelMixin,
+    mixins.CreateModelMixin,
 ):
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = NameCursorPagination
+    query_budgets = {"list": 2, "create": 2}
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by("-name")
+        return self.queryset.filter(user=self.request.user).order_by("-name", "-id")
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        cache_key = settings.CACHE_LISTS and list_cache_key(
+            self.queryset.model, request
+        )
+        cached = cache.get(cache_key) if cache_key else None
+        if cached is None:
+            with primary_reads() if cache_key else nullcontext():
+                data = super().list(request, *args, **kwargs).data
+            cached = (data, data_etag(data))
+            if cache_key:
+                cache.set(cache_key, cached)
+
+        data, etag = cached
+        response = get_conditional_response(request, etag=etag) or Response(data)
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
 
 class TagView(AuthenticatedListCreateView):
     queryset = Tag.objects.all()
@@ -32,14 +99,34 @@ class IngredientView(AuthenticatedListCreateView):
     serializer_class = IngredientSerializer
 
 
-class RecipeView(viewsets.ModelViewSet):
-    queryset = Recipe.objects.all()
+class RecipeView(StickyReadsMixin, ValuesListModelMixin, viewsets.ModelViewSet):
+    queryset = Recipe.objects.defer("search_text", "search_vector")
     serializer_class = RecipeSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = RecipeCursorPagination
+    filter_backends = (RecipeFilterBackend,)
+    bulk_max_recipes = 1000
+    query_budgets = {
+        "list": 5,
+        "retrieve": 5,
+        "create": 19,
+        "update": 24,
+        "partial_update": 24,
+        "destroy": 7,
+        "bulk": 21,
+    }
+    export_chunk_size = 500
+    export_layouts = {
+        "json": (stream_json_array, "application/json", "json"),
+        "jsonl": (stream_json_lines, "application/x-ndjson", "jsonl"),
+    }
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by("-title")
+        queryset = self.queryset.filter(user=self.request.user).order_by(
+            "-title", "-id"
+        )
+        return self.get_serializer_class().setup_eager_loading(queryset)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -49,3 +136,99 @@ class RecipeView(viewsets.ModelViewSet):
             return RecipeDetailSerializer
 
         return RecipeSerializer
+
+    @action(detail=False, methods=["post", "put"])
+    def bulk(self, request):
+        updating = request.method == "PUT"
+        serializer = BulkRecipeSerializer(
+            self.queryset.filter(user=request.user) if updating else None,
+            data=request.data,
+            many=True,
+            max_length=self.bulk_max_recipes,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        if updating:
+            saved = serializer.save()
+        else:
+            saved = serializer.save(user=request.user)
+        saved_ids = [recipe.id for recipe in saved]
+
+        recipes = self.get_queryset().in_bulk(saved_ids)
+        with timed("serialize"):
+            data = RecipeSerializer([recipes[pk] for pk in saved_ids], many=True).data
+        return Response(
+            data, status=status.HTTP_200_OK if updating else status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        layout = request.query_params.get("layout", "json")
+        if layout not in self.export_layouts:
+            raise ValidationError(
+                {"layout": f"Choose one of: {', '.join(self.export_layouts)}."}
+            )
+
+        stream, content_type, extension = self.export_layouts[layout]
+        recipes = iter_serialized(
+            self.queryset.filter(user=request.user),
+            RecipeDetailSerializer,
+            self.export_chunk_size,
+        )
+        content = stream(recipes)
+        if isinstance(request._request, ASGIRequest):
+            content = iter_in_thread(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="recipes.{extension}"'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        # No Last-Modified, as deleting the latest recipe would move it back.
+        # The count changes the ETag instead
+        validators = self.filter_queryset(self.get_queryset()).aggregate(
+            count=Count("*"), latest=Max("updated_at")
+        )
+        return self.conditional_response(
+            validators, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+            validators = (
+                self.get_queryset()
+                .filter(pk=pk)
+                .aggregate(
+                    recipe=Max("updated_at"),
+                    tags=Max("tags__updated_at"),
+                    ingredients=Max("ingredients__updated_at"),
+                )
+            )
+        except (TypeError, ValueError):
+            validators = {}
+
+        last_modified = max(filter(None, validators.values()), default=None)
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        return self.conditional_response(
+            {**validators, "last_modified": last_modified},
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def conditional_response(self, validators, handler, request, *args, **kwargs):
+        etag = validators_etag(request, validators)
+        last_modified = validators.get("last_modified")
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        ) or handler(request, *args, **kwargs)
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_vary_headers(response, ("Authorization",))
+        return response
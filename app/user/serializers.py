@@ -1,7 +1,10 @@
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.backends import ModelBackend
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.serializers import TimedSerializerMixin
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,30 +23,46 @@ class UserSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         password = validated_data.pop("password", None)
-        user = super().update(instance, validated_data)
-
         if password:
-            user.set_password(password)
-            user.save()
+            instance.set_password(password)
 
-        return user
+        return super().update(instance, validated_data)
 
 
-class AuthTokenSerializer(serializers.Serializer):
+class AuthTokenSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.CharField()
     password = serializers.CharField(
         style={"input_type": "password"}, trim_whitespace=False
     )
 
     def validate(self, attrs):
-        email = attrs["email"]
-        password = attrs["password"]
-        user = authenticate(
-            request=self.context.get("request"), username=email, password=password
-        )
+        user = self.authenticate(attrs["email"], attrs["password"])
         if not user:
             msg = _("Unable to authenticate with provided credentials")
             raise serializers.ValidationError(msg, code="authentication")
 
         attrs["user"] = user
         return attrs
+
+    def authenticate(self, email, password):
+        """Authenticates like ModelBackend, also fetching the user's token."""
+        user_model = get_user_model()
+        user = (
+            user_model._default_manager.select_related("auth_token")
+            .filter(**{user_model.USERNAME_FIELD: email})
+            .first()
+        )
+        if user is None:
+            # Hash anyway, so unknown emails take as long as wrong passwords
+            user_model().set_password(password)
+        elif user.check_password(password) and ModelBackend().user_can_authenticate(
+            user
+        ):
+            return user
+
+        user_login_failed.send(
+            sender=__name__,
+            credentials={"username": email},
+            request=self.context.get("request"),
+        )
+        return None
@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 CREATE_USER_URL = reverse("user:create")
@@ -57,6 +61,43 @@ class PublicUserApiTest(TestCase):
         self.assertIn("token", res.data)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
+    def test_token_is_reused_in_a_single_query(self):
+        payload = {"email": "some@email.com", "password": "irrelevant"}
+        create_user(**payload)
+        first = self.client.post(TOKEN_URL, payload)
+
+        with self.assertNumQueries(1):
+            second = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(first.data["token"], second.data["token"])
+
+    def test_last_login_is_recorded_at_most_once_per_interval(self):
+        payload = {"email": "some@email.com", "password": "irrelevant"}
+        user = create_user(**payload)
+
+        self.client.post(TOKEN_URL, payload)
+        user.refresh_from_db()
+        first_login = user.last_login
+        self.client.post(TOKEN_URL, payload)
+        user.refresh_from_db()
+
+        self.assertIsNotNone(first_login)
+        self.assertEqual(user.last_login, first_login)
+
+    @override_settings(TOKEN_TTL=60)
+    def test_expired_token_is_rotated_on_login(self):
+        payload = {"email": "some@email.com", "password": "irrelevant"}
+        user = create_user(**payload)
+        old_token = Token.objects.create(user=user)
+        Token.objects.filter(pk=old_token.pk).update(
+            created=timezone.now() - timedelta(minutes=5)
+        )
+
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertNotEqual(res.data["token"], old_token.key)
+        self.assertFalse(Token.objects.filter(pk=old_token.pk).exists())
+
     def test_return_400_when_creds_are_invalid(self):
         create_user(email="test@test.com", password="good pass")
         payload = {"email": "test@test.com", "password": "bad pass"}
@@ -65,6 +106,14 @@ class PublicUserApiTest(TestCase):
         self.assertNotIn("token", res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_return_400_if_user_is_inactive(self):
+        create_user(email="test@test.com", password="good pass", is_active=False)
+        payload = {"email": "test@test.com", "password": "good pass"}
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertNotIn("token", res.data)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_return_400_if_user_not_found(self):
         payload = {"email": "test@test.com", "password": "irrelevant"}
         res = self.client.post(TOKEN_URL, payload)
@@ -1,7 +1,11 @@
-from rest_framework import authentication, generics, permissions
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from core.authentication import CachedTokenAuthentication, issue_token, record_login
+from core.db_routers import client_sticky_key, stick_to_primary, user_sticky_key
+from core.views import StickyReadsMixin
 from user.serializers import AuthTokenSerializer, UserSerializer
 
 
@@ -12,11 +16,25 @@ class CreateUserView(generics.CreateAPIView):
 class CreateTokenView(ObtainAuthToken):
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    query_budgets = {"post": 7}
 
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data["user"]
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+        token = issue_token(user)
+        record_login(user)
+        # The token may not have reached the replicas when the client first uses it
+        authorization = f"{CachedTokenAuthentication.keyword} {token.key}"
+        stick_to_primary(client_sticky_key(authorization), user_sticky_key(user.pk))
+        return Response({"token": token.key})
+
+
+class ManageUserView(StickyReadsMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_object(self):